@@ -0,0 +1,152 @@
+"""Offline benchmark of the nine data endpoints against recorded upstream fixtures
+
+Starts bench/stub_server.py in-process, points index.py at it and reports per endpoint:
+- cold: a full rebuild per request (caches and datasets reset), upstream latency from the stub included
+- warm: requests answered from the built dataset, the path most traffic takes
+- peak: the largest python heap allocation during one cold build, from tracemalloc
+
+    python bench/run.py --iterations 20 --latency 20
+    python bench/run.py --synthesize    # offline, e.g. in CI, without recorded fixtures
+    python bench/run.py --json bench_output.json
+    python bench/run.py --baseline bench_output.json --tolerance 0.25    # exits 1 on a regression
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tracemalloc
+import httpx
+from stub_server import FIXTURES_DIR, app_environment, start_in_thread
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENDPOINTS = (
+    "/api/NBA/schedules", "/api/NBA/standings", "/api/NBA/players",
+    "/api/MLB/schedules", "/api/MLB/standings", "/api/MLB/players",
+    "/api/SOCCER/schedules", "/api/SOCCER/standings", "/api/SOCCER/players",
+)
+# compared against the baseline, the rest is reported only
+GATED = ("cold_p50_ms", "warm_p50_ms", "peak_kib")
+
+def load_app(base_url):
+    os.environ.update(app_environment(base_url))
+    os.environ.setdefault("SPORTSDATA_APIKEY", "bench")
+    os.environ.setdefault("FOOTBALL_DATA_APIKEY", "bench")
+    # no refresh loop, snapshots or quotas getting between the requests and the handlers
+    os.environ["BACKGROUND_REFRESH"] = "0"
+    os.environ["SNAPSHOT_PATH"] = ""
+    for name in ("SPORTSDATA_RATE_LIMIT", "STATSAPI_RATE_LIMIT", "FOOTBALL_DATA_RATE_LIMIT"):
+        os.environ[name] = "1000000"
+    sys.path.insert(0, ROOT)
+    import index
+    return index
+
+def reset(index):
+    # forget everything built so far, the next request rebuilds from the stub
+    index.upstream_cache.entries.clear()
+    index.mlb_schedule_cache.entries.clear()
+    index.mlb_standings_memo.clear()
+    for dataset in index.refresher.datasets.values():
+        dataset.body = None
+        dataset.built_at = None
+        dataset.next_refresh = 0
+        dataset.snapshot_checked = True
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+async def timed_get(client, endpoint):
+    started = time.perf_counter()
+    res = await client.get(endpoint, headers={"Accept-Encoding": "br, gzip"})
+    elapsed = time.perf_counter() - started
+    if res.status_code != 200:
+        raise SystemExit(f"{endpoint} answered {res.status_code}: {res.text[:200]}")
+    return elapsed
+
+async def bench_endpoint(index, client, endpoint, iterations):
+    cold = []
+    for _ in range(iterations):
+        reset(index)
+        cold.append(await timed_get(client, endpoint))
+
+    # one more cold build under tracemalloc, kept apart since tracing slows everything down
+    reset(index)
+    tracemalloc.start()
+    await timed_get(client, endpoint)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    warm = [await timed_get(client, endpoint) for _ in range(iterations * 10)]
+    return {
+        "cold_p50_ms": round(percentile(cold, 50) * 1000, 2),
+        "cold_p99_ms": round(percentile(cold, 99) * 1000, 2),
+        "cold_rps": round(len(cold) / sum(cold), 1),
+        "warm_p50_ms": round(percentile(warm, 50) * 1000, 3),
+        "warm_p99_ms": round(percentile(warm, 99) * 1000, 3),
+        "warm_rps": round(len(warm) / sum(warm), 1),
+        "peak_kib": round(peak / 1024),
+    }
+
+async def run(index, endpoints, iterations):
+    results = {}
+    async with index.app.router.lifespan_context(index.app):
+        transport = httpx.ASGITransport(app=index.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for endpoint in endpoints:
+                results[endpoint] = await bench_endpoint(index, client, endpoint, iterations)
+    return results
+
+def print_table(results):
+    columns = ("cold_p50_ms", "cold_p99_ms", "cold_rps", "warm_p50_ms", "warm_p99_ms", "warm_rps", "peak_kib")
+    print(f"{'endpoint':<24}" + "".join(f"{column:>13}" for column in columns))
+    for endpoint, result in results.items():
+        print(f"{endpoint:<24}" + "".join(f"{result[column]:>13}" for column in columns))
+
+def regressions(results, baseline, tolerance):
+    found = []
+    for endpoint, result in results.items():
+        for metric in GATED:
+            before = baseline.get(endpoint, {}).get(metric)
+            if before and result[metric] > before * (1 + tolerance):
+                found.append(f"{endpoint} {metric}: {before} -> {result[metric]}")
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--synthesize", action="store_true", help="generated payloads instead of recorded fixtures")
+    parser.add_argument("--latency", type=float, default=0, help="stub milliseconds per upstream response")
+    parser.add_argument("--jitter", type=float, default=0)
+    parser.add_argument("--iterations", type=int, default=20, help="cold requests per endpoint, warm ones are 10x")
+    parser.add_argument("--endpoint", action="append", help="only these endpoints, repeatable")
+    parser.add_argument("--json", help="write the results here")
+    parser.add_argument("--baseline", help="results of an earlier run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown before a metric counts as regressed")
+    args = parser.parse_args()
+
+    if not args.synthesize and not os.path.isdir(args.fixtures):
+        raise SystemExit(f"no fixtures in {args.fixtures}, record them with bench/stub_server.py --record or use --synthesize")
+    server, base_url = start_in_thread(fixtures=args.fixtures, latency_ms=args.latency, jitter_ms=args.jitter,
+                                       synthesize=args.synthesize)
+    try:
+        index = load_app(base_url)
+        results = asyncio.run(run(index, args.endpoint or ENDPOINTS, args.iterations))
+    finally:
+        server.shutdown()
+
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as file:
+            found = regressions(results, json.load(file), args.tolerance)
+        for line in found:
+            print(f"regression: {line}", file=sys.stderr)
+        if found:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""Local stand-in for sportsdata.io, statsapi.mlb.com and football-data.org
+
+Replays the responses saved under bench/fixtures, records them from the real apis with --record,
+or answers with generated season-sized payloads with --synthesize (no fixtures or api keys needed).
+Point the app at it with the environment printed on startup:
+
+    python bench/stub_server.py --record    # once, with SPORTSDATA_APIKEY / FOOTBALL_DATA_APIKEY set in the app
+    python bench/stub_server.py --latency 50 --jitter 20
+    python bench/stub_server.py --synthesize
+"""
+import os
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+import httpx
+from glob import glob
+from urllib.parse import urlsplit, parse_qsl
+from synthetic import SyntheticUpstream
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# path prefix on the stub -> the real host it stands in for
+UPSTREAMS = {
+    "sportsdata": "https://api.sportsdata.io",
+    "statsapi": "https://statsapi.mlb.com",
+    "football_data": "https://api.football-data.org",
+}
+# request headers passed through when recording, they carry the api keys
+FORWARDED_HEADERS = ("Ocp-Apim-Subscription-Key", "X-Auth-Token", "Accept")
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def app_environment(base_url):
+    # the base urls index.py reads, all pointing at the stub
+    return {
+        "SPORTSDATA_URL": f"{base_url}/sportsdata/v3/nba/scores/json",
+        "SPORTSDATA_STATS_URL": f"{base_url}/sportsdata/v3/nba/stats/json",
+        "MLB_STATSAPI_URL": f"{base_url}/statsapi/api/v1",
+        "FOOTBALL_DATA_URL": f"{base_url}/football_data/v4",
+    }
+
+def fixture_name(path, query):
+    # readable path plus a hash of the sorted query, so requests differing only in parameters get their own file
+    slug = path.strip("/").replace("/", "_") or "root"
+    if not query:
+        return slug
+    params = "&".join(sorted(query.split("&")))
+    return f"{slug}__{hashlib.sha1(params.encode()).hexdigest()[:10]}"
+
+class FixtureStore:
+    """Response bodies saved as <fixtures>/<provider>/<fixture name>.json"""
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, provider, name):
+        return os.path.join(self.root, provider, f"{name}.json")
+
+    def load(self, provider, path, query):
+        exact = self.path(provider, fixture_name(path, query))
+        if os.path.exists(exact):
+            return exact
+        # date windows move with the clock, fall back to the latest recording of the same path
+        slug = fixture_name(path, "")
+        candidates = glob(self.path(provider, glob_escape(slug))) + glob(self.path(provider, f"{glob_escape(slug)}__*"))
+        return max(candidates, key=os.path.getmtime) if candidates else None
+
+    def save(self, provider, path, query, body):
+        fixture = self.path(provider, fixture_name(path, query))
+        os.makedirs(os.path.dirname(fixture), exist_ok=True)
+        with open(fixture, "wb") as file:
+            file.write(body)
+        return fixture
+
+def glob_escape(name):
+    return "".join(f"[{ch}]" if ch in "*?[" else ch for ch in name)
+
+class StubHandler(BaseHTTPRequestHandler):
+    # set on the server class by make_server()
+    store = None
+    record = False
+    latency = 0.0
+    jitter = 0.0
+    client = None
+    synthetic = None
+    # generated bodies by request, so every replay of a request costs the same
+    synthesized = {}
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        provider, _, path = url.path.lstrip("/").partition("/")
+        if provider not in UPSTREAMS:
+            return self.reply(404, b'{"error": "unknown provider"}')
+
+        if self.record:
+            headers = {k: self.headers[k] for k in FORWARDED_HEADERS if k in self.headers}
+            res = self.client.get(f"{UPSTREAMS[provider]}/{path}", params=url.query or None, headers=headers)
+            if res.status_code == 200:
+                fixture = self.store.save(provider, path, url.query, res.content)
+                self.log_message("recorded %s", fixture)
+            return self.reply(res.status_code, res.content)
+
+        if self.synthetic is not None:
+            body = self.synthesized.get(self.path)
+            if body is None:
+                payload = self.synthetic.respond(provider, path, dict(parse_qsl(url.query)))
+                if payload is None:
+                    return self.reply(404, b'{"error": "no synthetic payload for this request"}')
+                body = self.synthesized[self.path] = json.dumps(payload).encode()
+        else:
+            fixture = self.store.load(provider, path, url.query)
+            if fixture is None:
+                return self.reply(404, b'{"error": "no fixture recorded for this request"}')
+            with open(fixture, "rb") as file:
+                body = file.read()
+        time.sleep(self.latency + random.uniform(0, self.jitter))
+        self.reply(200, body)
+
+    def reply(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.record:
+            super().log_message(format, *args)
+
+def make_server(host="127.0.0.1", port=0, fixtures=FIXTURES_DIR, record=False, latency_ms=0, jitter_ms=0, synthesize=False):
+    handler = type("Handler", (StubHandler,), {
+        "store": FixtureStore(fixtures),
+        "record": record,
+        "latency": latency_ms / 1000,
+        "jitter": jitter_ms / 1000,
+        "client": httpx.Client(timeout=30) if record else None,
+        "synthetic": SyntheticUpstream() if synthesize else None,
+        "synthesized": {},
+    })
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+def start_in_thread(**options):
+    # for the benchmark, which runs the stub and the app in one process
+    server = make_server(**options)
+    threading.Thread(target=server.serve_forever, name="stub-server", daemon=True).start()
+    return server, f"http://{server.server_address[0]}:{server.server_address[1]}"
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--record", action="store_true", help="proxy to the real apis and save what they return")
+    parser.add_argument("--synthesize", action="store_true", help="serve generated payloads instead of fixtures")
+    parser.add_argument("--latency", type=float, default=0, help="milliseconds added to every replayed response")
+    parser.add_argument("--jitter", type=float, default=0, help="up to this many extra random milliseconds")
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.fixtures, args.record, args.latency, args.jitter, args.synthesize)
+    base_url = f"http://{args.host}:{server.server_address[1]}"
+    source = "generated payloads" if args.synthesize else f"fixtures in {args.fixtures}"
+    print(f"{'recording' if args.record else 'replaying'} on {base_url}, {source}", file=sys.stderr)
+    for name, value in app_environment(base_url).items():
+        print(f"export {name}={value}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Synthetic stand-ins for the upstream payloads, for benchmarking without recorded fixtures
+
+Same field names and nesting as the real apis and roughly a real season's size: 1230 NBA games,
+15 MLB games a day and a 380 match Premier League season. Seeded, so every run sees the same data.
+"""
+import random
+from datetime import date, timedelta
+
+def season_days(start, end):
+    day = start
+    while day <= end:
+        yield day
+        day += timedelta(days=1)
+
+class SyntheticUpstream:
+    def __init__(self, seed=1, today=None):
+        self.random = random.Random(seed)
+        self.today = today or date.today()
+        self.nba_teams = [{"TeamID": i, "Key": f"N{i:02d}", "Active": True, "City": f"City {i}", "Name": f"Team {i}",
+                           "Conference": "Eastern" if i <= 15 else "Western", "Division": f"Division {i % 6}",
+                           "WikipediaLogoUrl": f"https://example.com/nba/{i}.svg"} for i in range(1, 31)]
+        self.mlb_teams = [{"id": 108 + i, "name": f"MLB Team {i}", "abbreviation": f"M{i:02d}", "teamName": f"Club {i}",
+                           "clubName": f"Club {i}", "locationName": f"Location {i}", "season": self.today.year,
+                           "league": {"id": 103 if i < 15 else 104, "name": "American League" if i < 15 else "National League"},
+                           "division": {"id": 200 + i % 3 + (0 if i < 15 else 3), "name": f"Division {i % 3}"}}
+                          for i in range(30)]
+        self.mlb_roster = [{"id": 600000 + i, "fullName": f"Player {i}", "active": True,
+                            "currentTeam": {"id": 108 + i % 30, "link": f"/api/v1/teams/{108 + i % 30}"}}
+                           for i in range(60)]
+        self.soccer_teams = [{"id": 57 + i, "name": f"Football Club {i}", "shortName": f"Club {i}", "tla": f"F{i:02d}",
+                              "crest": f"https://example.com/soccer/{i}.png"} for i in range(20)]
+
+    def game_state(self, day):
+        if day < self.today:
+            return "Final"
+        return "InProgress" if day == self.today else "Scheduled"
+
+    # sportsdata.io
+    def nba_schedules(self, season):
+        games = []
+        days = list(season_days(date(season - 1, 10, 20), date(season, 4, 12)))
+        for game_id in range(1230):
+            day = days[game_id * len(days) // 1230]
+            home, away = self.random.sample(self.nba_teams, 2)
+            played = day <= self.today
+            games.append({
+                "GameID": 20000 + game_id, "Season": season, "SeasonType": 1, "Status": self.game_state(day),
+                "Day": f"{day}T00:00:00", "DateTime": f"{day}T19:30:00", "DateTimeUTC": f"{day}T23:30:00",
+                "HomeTeam": home["Key"], "HomeTeamID": home["TeamID"], "AwayTeam": away["Key"], "AwayTeamID": away["TeamID"],
+                "HomeTeamScore": self.random.randint(90, 130) if played else None,
+                "AwayTeamScore": self.random.randint(90, 130) if played else None,
+                "StadiumID": home["TeamID"], "Channel": "NBATV", "IsClosed": day < self.today,
+                "Updated": f"{day}T23:59:00", "GlobalGameID": 20020000 + game_id,
+            })
+        return games
+
+    def nba_standings(self, season):
+        return [{"Season": season, "TeamID": team["TeamID"], "Key": team["Key"], "City": team["City"], "Name": team["Name"],
+                 "Conference": team["Conference"], "Division": team["Division"],
+                 "Wins": (wins := self.random.randint(10, 60)), "Losses": 70 - wins, "Percentage": round(wins / 70, 3),
+                 "ConferenceWins": 20, "ConferenceLosses": 20, "HomeWins": wins // 2, "HomeLosses": 17, "AwayWins": wins - wins // 2,
+                 "AwayLosses": 18, "LastTenWins": 5, "LastTenLosses": 5, "GamesBack": 3.5, "StreakDescription": "W2"}
+                for team in self.nba_teams]
+
+    def nba_player_stats(self, season):
+        return [{"PlayerID": 20000000 + i, "Season": season, "Name": f"NBA Player {i}", "Team": team["Key"], "TeamID": team["TeamID"],
+                 "Position": self.random.choice(["PG", "SG", "SF", "PF", "C"]), "Games": 60,
+                 "FantasyPoints": round(self.random.uniform(0, 3500), 1), "Points": self.random.randint(0, 2500),
+                 "Rebounds": self.random.randint(0, 1000), "Assists": self.random.randint(0, 700), "Steals": self.random.randint(0, 150),
+                 "BlockedShots": self.random.randint(0, 150), "PlayerEfficiencyRating": round(self.random.uniform(0, 30), 1),
+                 "PlusMinus": self.random.randint(-400, 400), "Minutes": self.random.randint(0, 2800)}
+                for i, team in ((i, self.random.choice(self.nba_teams)) for i in range(540))]
+
+    # statsapi.mlb.com
+    def mlb_schedule(self, start, end):
+        dates = []
+        for day in season_days(start, end):
+            games = []
+            for k in range(15):
+                home, away = self.mlb_teams[(day.toordinal() + k) % 30], self.mlb_teams[(day.toordinal() + k + 15) % 30]
+                state = self.game_state(day)
+                games.append({
+                    "gamePk": day.toordinal() * 100 + k, "gameGuid": f"{day}-{k}", "gameDate": f"{day}T23:05:00Z",
+                    "seriesDescription": "Regular Season",
+                    "status": {"abstractGameState": "Final" if state == "Final" else "Preview", "detailedState": state},
+                    "teams": {side: {"team": {"id": team["id"], "name": team["name"]},
+                                     "score": self.random.randint(0, 10) if state != "Scheduled" else None,
+                                     "leagueRecord": {"wins": 50, "losses": 40, "pct": ".556"}}
+                              for side, team in (("home", home), ("away", away))},
+                })
+            dates.append({"date": str(day), "totalGames": len(games), "games": games})
+        return {"totalGames": sum(len(d["games"]) for d in dates), "dates": dates}
+
+    def mlb_standings(self):
+        records = []
+        for division in sorted({team["division"]["id"] for team in self.mlb_teams}):
+            team_records = []
+            for rank, team in enumerate(t for t in self.mlb_teams if t["division"]["id"] == division):
+                record = lambda wins, losses, **extra: {"wins": wins, "losses": losses, **extra}
+                team_records.append({
+                    "team": {"id": team["id"], "name": team["name"]}, "leagueRank": str(rank + 1), "leagueGamesBack": "-",
+                    "streak": {"streakCode": "W2"}, "leagueRecord": {"wins": 80, "losses": 70, "ties": 0, "pct": ".533"},
+                    "records": {
+                        "leagueRecords": [record(30, 20, league={"id": 103}), record(20, 30, league={"id": 104})],
+                        "overallRecords": [record(45, 30, type="home"), record(35, 40, type="away")],
+                        "splitRecords": [record(6, 4, type="lastTen"), record(40, 35, type="day")],
+                    },
+                })
+            records.append({"standingsType": "regularSeason", "division": {"id": division}, "teamRecords": team_records})
+        return {"records": records}
+
+    def mlb_people(self, query):
+        # like the real endpoint, currentTeam is only there when it is hydrated
+        ids = {int(person_id) for person_id in query.get("personIds", "").split(",") if person_id}
+        hydrated = "currentTeam" in query.get("hydrate", "")
+        return {"people": [person if hydrated else {k: v for k, v in person.items() if k != "currentTeam"}
+                           for person in self.mlb_roster if person["id"] in ids]}
+
+    def mlb_allstar(self, league_id):
+        offset = 0 if league_id == 103 else 30
+        return {"people": [{"id": person["id"], "fullName": person["fullName"], "primaryPosition": {"name": "Outfielder"},
+                            "batSide": {"code": "R", "description": "Right"}, "pitchHand": {"code": "R", "description": "Right"}}
+                           for person in self.mlb_roster[offset:offset + 30]]}
+
+    # football-data.org
+    def soccer_matches(self, season):
+        matches = []
+        days = list(season_days(date(season, 8, 10), date(season + 1, 5, 20)))
+        for match_id in range(380):
+            day = days[match_id * len(days) // 380]
+            home, away = self.random.sample(self.soccer_teams, 2)
+            state = self.game_state(day)
+            goals = lambda: self.random.randint(0, 4) if state != "Scheduled" else None
+            matches.append({
+                "id": 400000 + match_id, "utcDate": f"{day}T15:00:00Z", "matchday": match_id // 10 + 1, "stage": "REGULAR_SEASON",
+                "status": {"Final": "FINISHED", "InProgress": "IN_PLAY", "Scheduled": "TIMED"}[state],
+                "homeTeam": home, "awayTeam": away, "lastUpdated": f"{day}T17:00:00Z",
+                "score": {"winner": None, "duration": "REGULAR", "fullTime": {"home": goals(), "away": goals()},
+                          "halfTime": {"home": None, "away": None}},
+                "referees": [{"id": 11000 + match_id % 20, "name": f"Referee {match_id % 20}", "type": "REFEREE"}],
+            })
+        return {"filters": {"season": str(season)}, "resultSet": {"count": len(matches)}, "matches": matches}
+
+    def soccer_standings(self, season):
+        table = [{"position": i + 1, "team": team, "playedGames": 30, "form": "W,D,L,W,W", "won": 15, "draw": 5, "lost": 10,
+                  "points": 50 - i, "goalsFor": 45, "goalsAgainst": 35, "goalDifference": 10}
+                 for i, team in enumerate(self.soccer_teams)]
+        return {"filters": {"season": str(season)}, "competition": {"id": 2021, "name": "Premier League", "emblem": "https://example.com/pl.png"},
+                "standings": [{"stage": "REGULAR_SEASON", "type": "TOTAL", "table": table}]}
+
+    def soccer_scorers(self, query):
+        return {"scorers": [{"player": {"id": 3000 + i, "name": f"Scorer {i}", "section": "Offence"}, "team": self.soccer_teams[i % 20],
+                             "playedMatches": 30, "goals": 25 - i, "assists": 5}
+                            for i in range(int(query.get("limit", 10)))]}
+
+    def respond(self, provider, path, query):
+        # the payload for one upstream request, None for paths the app never calls
+        parts = path.strip("/").split("/")
+        if provider == "sportsdata" and len(parts) >= 5:
+            season = int("".join(ch for ch in parts[-1] if ch.isdigit()) or self.today.year)
+            handlers = {"teams": lambda: self.nba_teams, "SchedulesBasic": lambda: self.nba_schedules(season),
+                        "Standings": lambda: self.nba_standings(season), "PlayerSeasonStats": lambda: self.nba_player_stats(season)}
+            handler = handlers.get(parts[-2])
+            return handler() if handler else None
+        if provider == "statsapi":
+            if parts[-2:-1] == ["seasons"]:
+                year = int(parts[-1])
+                if year > self.today.year:
+                    return {"seasons": []}
+                return {"seasons": [{"seasonId": str(year), "seasonStartDate": f"{year}-03-27", "seasonEndDate": f"{year}-10-31"}]}
+            if parts[-1] == "schedule":
+                return self.mlb_schedule(date.fromisoformat(query["startDate"]), date.fromisoformat(query["endDate"]))
+            if parts[-1] == "teams":
+                return {"teams": self.mlb_teams}
+            if parts[-1] == "standings":
+                return self.mlb_standings()
+            if parts[-1] == "people":
+                return self.mlb_people(query)
+            if parts[-1] == "allStarFinalVote":
+                return self.mlb_allstar(int(parts[-2]))
+            return None
+        if provider == "football_data" and parts:
+            season = int(query.get("season", self.today.year))
+            handlers = {"matches": lambda: self.soccer_matches(season), "standings": lambda: self.soccer_standings(season),
+                        "scorers": lambda: self.soccer_scorers(query)}
+            handler = handlers.get(parts[-1])
+            return handler() if handler else None
+        return None
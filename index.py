@@ -1,14 +1,885 @@
 import os
-import mlbstatsapi
-import requests
-from requests.exceptions import HTTPError, ConnectionError 
-from mlbstatsapi.exceptions import TheMlbStatsApiException
-from itertools import groupby
-from fastapi import FastAPI, Response
+import sys
+import gzip
+import json
+import bisect
+import heapq
+import hmac
+import hashlib
+import time
+import asyncio
+import contextvars
+import sqlite3
+import tempfile
+import threading
+import types
+import typing
+import httpx
+import numpy as np
+from httpx import HTTPStatusError, TransportError
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager, closing, nullcontext
+from itertools import count, groupby, zip_longest
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime, timedelta
 
-app = FastAPI()
+# optional fast json encoder and brotli compression, the stdlib fallbacks produce the same responses
+try:
+    import orjson
+except ImportError:
+    orjson = None
+try:
+    import brotli
+except ImportError:
+    brotli = None
+# optional typed decoder, without it records are filled from the stdlib-decoded dicts
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# every upstream base url can be pointed elsewhere, e.g. at bench/stub_server.py
+MLB_STATSAPI_URL = os.getenv("MLB_STATSAPI_URL", "https://statsapi.mlb.com/api/v1")
+
+# one pooled client per upstream provider so keep-alive connections are reused across requests
+UPSTREAM_PROVIDERS = ("sportsdata", "statsapi", "football_data")
+UPSTREAM_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10, keepalive_expiry=60)
+# connect and read timeouts per provider, a stalled socket fails the call instead of holding the request
+UPSTREAM_TIMEOUTS = {
+    "sportsdata": httpx.Timeout(float(os.getenv("SPORTSDATA_TIMEOUT", 6)), connect=2),
+    "statsapi": httpx.Timeout(float(os.getenv("STATSAPI_TIMEOUT", 4)), connect=2),
+    "football_data": httpx.Timeout(float(os.getenv("FOOTBALL_DATA_TIMEOUT", 5)), connect=2),
+}
+http_clients = {}
+
+def provider_headers(provider):
+    if provider == "sportsdata":
+        headers = {"Ocp-Apim-Subscription-Key": sportsdata_apikey}
+    elif provider == "football_data":
+        headers = {"X-Auth-Token": FOOTBALL_DATA_APIKEY}
+    else:
+        headers = {}
+    return {k: v for k, v in headers.items() if v is not None}
+
+def get_http_client(provider):
+    # clients are created in the lifespan hook, lazily as a fallback for runtimes that skip it
+    client = http_clients.get(provider)
+    if client is None:
+        client = httpx.AsyncClient(headers=provider_headers(provider), limits=UPSTREAM_LIMITS,
+                                   timeout=UPSTREAM_TIMEOUTS[provider])
+        http_clients[provider] = client
+    return client
+
+# metrics
+# seconds, from a cache-warm transform up to a provider timing out
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+def metric_labels(names, values):
+    pairs = (f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+             for name, value in zip(names, values))
+    return "{" + ",".join(pairs) + "}"
+
+class Histogram:
+    """Prometheus histogram with fixed buckets, one series per tuple of label values"""
+
+    def __init__(self, name, help, labelnames, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.buckets = buckets
+        # label values -> [count per bucket plus +Inf, sum]
+        self.series = {}
+
+    def observe(self, labels, value):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total) in self.series.items():
+            cumulative = 0
+            for le, bucket_count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket_count
+                lines.append(f"{self.name}_bucket{metric_labels((*self.labelnames, 'le'), (*labels, le))} {cumulative}")
+            lines.append(f"{self.name}_sum{metric_labels(self.labelnames, labels)} {total}")
+            lines.append(f"{self.name}_count{metric_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+class Counter:
+    """Prometheus counter, one series per tuple of label values"""
+
+    def __init__(self, name, help, labelnames):
+        self.name = name
+        self.help = help
+        self.labelnames = labelnames
+        self.series = {}
+
+    def inc(self, labels, amount=1):
+        self.series[labels] = self.series.get(labels, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        for labels, value in self.series.items():
+            lines.append(f"{self.name}{metric_labels(self.labelnames, labels)} {value}")
+        return lines
+
+def render_series(name, help, labelnames, series, kind="gauge"):
+    # values read at scrape time from state the app keeps anyway
+    lines = [f"# HELP {name} {help}", f"# TYPE {name} {kind}"]
+    for labels, value in series.items():
+        lines.append(f"{name}{metric_labels(labelnames, labels)} {value}")
+    return lines
+
+phase_seconds = Histogram("gazette_phase_seconds", "Time an endpoint's build spent per phase", ("endpoint", "phase"))
+upstream_seconds = Histogram("gazette_upstream_request_seconds", "Upstream call latency, without the rate limit wait",
+                             ("provider", "resource"))
+upstream_bytes = Counter("gazette_upstream_bytes_total", "Bytes downloaded from upstream", ("provider",))
+
+class UpstreamClock:
+    """Wall time a build spent waiting on upstream calls, overlapping waits counted once"""
+
+    def __init__(self):
+        self.waiting = 0
+        self.started = None
+        self.total = 0.0
+
+    def __enter__(self):
+        if self.waiting == 0:
+            self.started = time.monotonic()
+        self.waiting += 1
+
+    def __exit__(self, *exc):
+        self.waiting -= 1
+        if self.waiting == 0:
+            self.total += time.monotonic() - self.started
+
+# the clock of the dataset build currently running, if any
+build_clock = contextvars.ContextVar("build_clock", default=None)
+
+class RateLimiter:
+    """Request quota of one upstream provider, callers over the quota queue by priority for a bounded time
+
+    Each of the `limit` tokens comes back `period` seconds after it was spent, so no window of that length
+    ever sees more than `limit` requests while bursts can still use the whole quota at once."""
+
+    def __init__(self, provider, limit, period=60.0):
+        self.provider = provider
+        self.limit = limit
+        self.period = period
+        self.spent = deque()
+        self.paused_until = 0
+        # (priority, arrival, future), lower priority values go first
+        self.waiters = []
+        self.arrivals = count()
+        self.timer = None
+
+    def available(self, now):
+        while self.spent and now - self.spent[0] >= self.period:
+            self.spent.popleft()
+        if now < self.paused_until:
+            return 0
+        return self.limit - len(self.spent)
+
+    async def acquire(self, priority, timeout):
+        if not self.waiters and self.available(time.monotonic()) > 0:
+            self.spent.append(time.monotonic())
+            return
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (priority, next(self.arrivals), waiter))
+        self.dispatch()
+        try:
+            # a timed out or cancelled waiter cancels its future, dispatch() then skips it
+            async with asyncio.timeout(timeout):
+                await waiter
+        except TimeoutError:
+            raise TimeoutError(f"Waited {timeout}s for the {self.provider} rate limit") from None
+
+    def dispatch(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        now = time.monotonic()
+        while self.waiters and (self.waiters[0][2].done() or self.available(now) > 0):
+            _, _, waiter = heapq.heappop(self.waiters)
+            if not waiter.done():
+                self.spent.append(now)
+                waiter.set_result(None)
+        if self.waiters:
+            # wake up when the oldest token comes back or the upstream pause ends
+            wake_at = max(self.paused_until, self.spent[0] + self.period if len(self.spent) >= self.limit else now)
+            self.timer = asyncio.get_running_loop().call_later(max(0, wake_at - now), self.dispatch)
+
+    def pause(self, seconds):
+        # the provider answered 429, hold every token until its Retry-After has passed
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def try_acquire(self):
+        # a token only if one is free right now, for calls that are optional
+        if not self.waiters and self.available(time.monotonic()) > 0:
+            self.spent.append(time.monotonic())
+            return True
+        return False
+
+    def status(self):
+        return {
+            "limit": self.limit,
+            "period": self.period,
+            "available": max(0, self.available(time.monotonic())),
+            "queued": sum(not waiter.done() for _, _, waiter in self.waiters)
+        }
+
+# requests per minute allowed by each provider's plan
+rate_limiters = {
+    "sportsdata": RateLimiter("sportsdata", int(os.getenv("SPORTSDATA_RATE_LIMIT", 60))),
+    "statsapi": RateLimiter("statsapi", int(os.getenv("STATSAPI_RATE_LIMIT", 600))),
+    "football_data": RateLimiter("football_data", int(os.getenv("FOOTBALL_DATA_RATE_LIMIT", 10))),
+}
+# live scores go first, directories and tables that barely change wait behind everything else
+RESOURCE_PRIORITY = {
+    "schedules": 0,
+    "players": 1,
+    "standings": 2,
+    "teams": 3,
+    "seasons": 3,
+}
+# longest a request waits in a provider's queue before it fails like a timed out upstream call
+RATE_LIMIT_WAIT = float(os.getenv("RATE_LIMIT_WAIT", os.getenv("UPSTREAM_DEADLINE", 8)))
+
+def check_rate_limited(provider, res):
+    if res.status_code == 429:
+        try:
+            retry_after = float(res.headers.get("Retry-After", 60))
+        except ValueError:
+            retry_after = 60
+        rate_limiters[provider].pause(retry_after)
+
+class UpstreamUnavailable(TransportError):
+    """Raised without calling the provider while its circuit breaker is open"""
+
+class CircuitBreaker:
+    """Fails calls to a provider fast after repeated errors, letting one trial call through per cooldown"""
+
+    def __init__(self, provider, threshold=5, cooldown=30.0):
+        self.provider = provider
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+
+    def allow(self):
+        if self.opened_at is None:
+            return True
+        now = time.monotonic()
+        if now - self.opened_at >= self.cooldown:
+            # half-open: this call is the trial, the next one waits for another cooldown
+            self.opened_at = now
+            return True
+        return False
+
+    def success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def failure(self):
+        self.failures += 1
+        if self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+
+    def status(self):
+        return {
+            "open": self.opened_at is not None,
+            "failures": self.failures
+        }
+
+circuit_breakers = {
+    provider: CircuitBreaker(provider, int(os.getenv("CIRCUIT_THRESHOLD", 5)), float(os.getenv("CIRCUIT_COOLDOWN", 30)))
+    for provider in UPSTREAM_PROVIDERS
+}
+
+class LatencyTracker:
+    """Durations of the last successful calls to one provider, for the hedging delay"""
+
+    def __init__(self, size=200, min_samples=20):
+        self.samples = deque(maxlen=size)
+        self.min_samples = min_samples
+
+    def record(self, seconds):
+        self.samples.append(seconds)
+
+    def p95(self):
+        if len(self.samples) < self.min_samples:
+            return None
+        return sorted(self.samples)[int(len(self.samples) * 0.95) - 1]
+
+upstream_latency = {provider: LatencyTracker() for provider in UPSTREAM_PROVIDERS}
+# duplicate a GET still running past the provider's p95, off by default since it spends quota
+HEDGE_REQUESTS = os.getenv("HEDGE_REQUESTS", "0") == "1"
+
+class TTLCache:
+    """Bounded in-memory cache, entries expire after their ttl and the least recently used go first when full"""
+
+    MISSING = object()
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self.misses += 1
+            return self.MISSING
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def get_stale(self, key):
+        # expired entries stay until they are evicted, the last good copy while a provider is down
+        entry = self.entries.get(key)
+        return self.MISSING if entry is None else entry[1]
+
+    def set(self, key, value, ttl):
+        self.entries[key] = (time.monotonic() + ttl, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        return {
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses
+        }
+
+# seconds each class of upstream resource stays cached, team lists change maybe once a season.
+# players/standings/schedules expire before the background refresh of the endpoints using them
+# (see DATASET_TTL), so a rebuild never picks up an almost expired copy
+CACHE_TTL = {
+    "teams": 3 * 24 * 3600,
+    "seasons": 24 * 3600,
+    "players": 3000,
+    "standings": 240,
+    "schedules": 30,
+}
+upstream_cache = TTLCache(maxsize=int(os.getenv("UPSTREAM_CACHE_SIZE", 256)))
+
+class Record:
+    """Fallback for msgspec structs: the declared fields in __slots__, copied out of an already decoded dict"""
+
+    __slots__ = ()
+    __annotations__ = {}
+
+    def __init__(self, **values):
+        for name, annotation in self.__annotations__.items():
+            if name in values:
+                setattr(self, name, values[name])
+            elif is_optional(annotation):
+                setattr(self, name, None)
+            else:
+                raise ValueError(f"{type(self).__name__} is missing required field {name!r}")
+
+    def __repr__(self):
+        return f"{type(self).__name__}({', '.join(f'{name}={getattr(self, name)!r}' for name in self.__annotations__)})"
+
+def is_optional(annotation):
+    return typing.get_origin(annotation) in (typing.Union, types.UnionType) and type(None) in typing.get_args(annotation)
+
+def record(name, fields):
+    # a slot struct holding only the fields a builder projects, every other key is skipped while decoding.
+    # optional fields default to None, the others must be present
+    ordered = sorted(fields.items(), key=lambda field: is_optional(field[1]))
+    if msgspec is not None:
+        # gc=False: records never reference each other in a cycle, the collector needn't track them
+        return msgspec.defstruct(name, [(field, annotation, None) if is_optional(annotation) else (field, annotation)
+                                        for field, annotation in ordered], kw_only=True, gc=False)
+    return type(name, (Record,), {"__slots__": tuple(fields), "__annotations__": dict(ordered)})
+
+def convert(annotation, value):
+    # turns stdlib-decoded json into the fallback records, the same shape msgspec produces
+    if value is None:
+        return None
+    origin = typing.get_origin(annotation)
+    if origin is list:
+        item_type, = typing.get_args(annotation)
+        return [convert(item_type, item) for item in value]
+    if origin in (typing.Union, types.UnionType):
+        for arg in typing.get_args(annotation):
+            if isinstance(arg, type) and issubclass(arg, Record):
+                return convert(arg, value)
+        return value
+    if isinstance(annotation, type) and issubclass(annotation, Record):
+        return annotation(**{name: convert(field_type, value[name])
+                             for name, field_type in annotation.__annotations__.items() if name in value})
+    return value
+
+typed_decoders = {}
+
+def decode_typed(schema, content):
+    if msgspec is not None:
+        decoder = typed_decoders.get(schema)
+        if decoder is None:
+            decoder = typed_decoders[schema] = msgspec.json.Decoder(schema)
+        return decoder.decode(content)
+    return convert(schema, json.loads(content))
+
+def index_by(key):
+    # builds an id -> item lookup once per fetched directory so joins don't rescan the list
+    def build(items):
+        return {item.get(key): item for item in items}
+    return build
+
+# upstream fetches currently running, keyed like the cache so identical misses wait on the same request
+upstream_inflight = {}
+
+async def timed_get(provider, url, params, timeout):
+    started = time.monotonic()
+    res = await get_http_client(provider).get(url, params=params, timeout=timeout)
+    if res.status_code < 500:
+        upstream_latency[provider].record(time.monotonic() - started)
+    return res
+
+async def upstream_get(provider, url, params, timeout):
+    # an idempotent GET, sent a second time if the first runs past the provider's p95 and quota is left
+    attempts = [asyncio.create_task(timed_get(provider, url, params, timeout))]
+    try:
+        hedge_after = upstream_latency[provider].p95() if HEDGE_REQUESTS else None
+        if hedge_after is not None:
+            done, _ = await asyncio.wait(attempts, timeout=hedge_after)
+            if not done and rate_limiters[provider].try_acquire():
+                attempts.append(asyncio.create_task(timed_get(provider, url, params, timeout)))
+        pending = set(attempts)
+        while True:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            # the first response wins, an error only counts once no other attempt is left
+            for task in sorted(done, key=lambda task: task.exception() is not None):
+                if task.exception() is None or not pending:
+                    return task.result()
+    finally:
+        for task in attempts:
+            task.cancel()
+
+def upstream_timeout(provider):
+    # the provider's timeouts, shortened to what is left of the request's deadline
+    timeout = UPSTREAM_TIMEOUTS[provider]
+    deadline_at = upstream_deadline_at.get()
+    if deadline_at is None:
+        return timeout
+    remaining = max(0.1, deadline_at - asyncio.get_running_loop().time())
+    return httpx.Timeout(min(timeout.read, remaining), connect=min(timeout.connect, remaining))
+
+async def fetch_upstream(key, provider, url, params, resource, transform, stream, priority, schema):
+    breaker = circuit_breakers[provider]
+    if not breaker.allow():
+        raise UpstreamUnavailable(f"{provider} is failing, calls are paused for up to {breaker.cooldown}s")
+
+    timeout = upstream_timeout(provider)
+    # only real upstream calls spend quota, cache hits and joined in-flight fetches never get here
+    await rate_limiters[provider].acquire(priority, min(RATE_LIMIT_WAIT, timeout.read))
+    started = time.monotonic()
+    try:
+        if stream:
+            # the transform consumes the array items as they arrive instead of a decoded payload
+            result = await transform(stream_json_array(provider, url, params, timeout))
+        else:
+            res = await upstream_get(provider, url, params, timeout)
+            # num_bytes_downloaded is the compressed size off the wire, content the decoded size
+            upstream_bytes.inc((provider,), res.num_bytes_downloaded or len(res.content))
+            check_rate_limited(provider, res)
+            res.raise_for_status()
+            # a schema decodes straight into records, without building the generic dicts first
+            result = decode_typed(schema, res.content) if schema is not None else res.json()
+            if transform is not None:
+                result = transform(result)
+    except HTTPStatusError as err:
+        # a 404 or 400 is the provider answering, only server errors and throttling count against it
+        if err.response.status_code >= 500 or err.response.status_code == 429:
+            breaker.failure()
+        else:
+            breaker.success()
+        raise
+    except TransportError:
+        breaker.failure()
+        raise
+    finally:
+        upstream_seconds.observe((provider, resource or "uncached"), time.monotonic() - started)
+    breaker.success()
+
+    if resource is not None:
+        upstream_cache.set(key, result, CACHE_TTL[resource])
+    return result
+
+async def fetch_json(provider, url, params=None, resource=None, transform=None, stream=False, priority=None, schema=None):
+    # payloads of a cached resource are shared between requests, handlers must not mutate them
+    key = (provider, url, tuple(sorted((params or {}).items())))
+    if resource is not None:
+        cached = upstream_cache.get(key)
+        if cached is not TTLCache.MISSING:
+            return cached
+
+    # single-flight: only one fetch per key at a time, every waiter gets its result or its error
+    task = upstream_inflight.get(key)
+    if task is None:
+        if priority is None:
+            priority = RESOURCE_PRIORITY.get(resource, 1)
+        task = asyncio.create_task(fetch_upstream(key, provider, url, params, resource, transform, stream, priority, schema))
+        upstream_inflight[key] = task
+
+        def done(task):
+            if upstream_inflight.get(key) is task:
+                del upstream_inflight[key]
+            # retrieve the error in case every waiter was cancelled before it arrived
+            task.cancelled() or task.exception()
+
+        task.add_done_callback(done)
+
+    clock = build_clock.get()
+    try:
+        with clock if clock is not None else nullcontext():
+            # shielded so one cancelled waiter doesn't abort the fetch the others share
+            return await asyncio.shield(task)
+    except UpstreamUnavailable:
+        # while the provider's circuit is open, fall back to the last good payload if one is left
+        if resource is not None:
+            stale = upstream_cache.get_stale(key)
+            if stale is not TTLCache.MISSING:
+                return stale
+        raise
+
+async def stream_json_array(provider, url, params=None, timeout=None):
+    # yields the items of a top-level json array as they arrive, without holding the decoded payload in memory
+    decoder = json.JSONDecoder()
+    async with get_http_client(provider).stream("GET", url, params=params,
+                                                 timeout=timeout or UPSTREAM_TIMEOUTS[provider]) as res:
+        try:
+            check_rate_limited(provider, res)
+            res.raise_for_status()
+            buffer = ""
+            pos = 0
+            started = False
+            async for chunk in res.aiter_text():
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                if not started:
+                    buffer = buffer.lstrip()
+                    if not buffer:
+                        continue
+                    if buffer[0] != "[":
+                        raise ValueError(f"Expected a JSON array from {url}")
+                    buffer = buffer[1:]
+                    started = True
+                while True:
+                    while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                        pos += 1
+                    if pos < len(buffer) and buffer[pos] == "]":
+                        return
+                    try:
+                        item, pos_end = decoder.raw_decode(buffer, pos)
+                    except json.JSONDecodeError:
+                        # the item continues in the next chunk
+                        break
+                    if pos_end == len(buffer):
+                        # a number at the end of the buffer may have more digits in the next chunk, and a complete
+                        # item is always followed by a "," or the closing "]"
+                        break
+                    pos = pos_end
+                    yield item
+            raise ValueError(f"Truncated JSON array from {url}")
+        finally:
+            upstream_bytes.inc((provider,), res.num_bytes_downloaded)
+
+# every upstream call made for a single request has to finish within this many seconds
+UPSTREAM_DEADLINE = float(os.getenv("UPSTREAM_DEADLINE", 8))
+# event loop time the current request's upstream calls have to finish by, caps each call's own timeouts
+upstream_deadline_at = contextvars.ContextVar("upstream_deadline_at", default=None)
+
+async def gather_with_deadline(*aws, deadline=UPSTREAM_DEADLINE):
+    # independent upstream calls run concurrently, so the request waits for the slowest one instead of the sum
+    deadline_at = asyncio.get_running_loop().time() + deadline
+    if upstream_deadline_at.get() is not None:
+        # a nested gather never extends the budget of the one around it
+        deadline_at = min(deadline_at, upstream_deadline_at.get())
+    token = upstream_deadline_at.set(deadline_at)
+    try:
+        async with asyncio.timeout_at(deadline_at):
+            return await asyncio.gather(*aws)
+    finally:
+        upstream_deadline_at.reset(token)
+
+# seconds an endpoint's data is served before it is rebuilt, live scores change far more often than rosters
+DATASET_TTL = {
+    "players": 3600,
+    "standings": 300,
+    "schedules": 60,
+}
+# refresh this fraction of the ttl ahead of expiry, and wait this long before retrying a failed refresh
+REFRESH_AHEAD = 0.1
+REFRESH_RETRY = 30
+
+def dumps_json(obj):
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode()
+
+# responses smaller than this aren't worth compressing
+COMPRESS_MIN_SIZE = 1024
+
+class EncodedBody:
+    """Success envelope of one dataset version, serialized and compressed once when the data changes"""
+
+    def __init__(self, data, indexer=None, view=None):
+        self.data = data
+        # lookup structures derived from the data, built once per version like the encodings
+        self.index = indexer(data) if indexer is not None else None
+        # what the endpoint serves, when the dataset keeps more than that (e.g. to answer query parameters from)
+        served = view(self.index) if view is not None else data
+        self.content = {"identity": dumps_json({"ok": True, "error": None, "data": served})}
+        # stable across processes as the builders always produce keys in the same order
+        self.etag = f'"{hashlib.blake2b(self.content["identity"], digest_size=16).hexdigest()}"'
+        if len(self.content["identity"]) >= COMPRESS_MIN_SIZE:
+            self.content["gzip"] = gzip.compress(self.content["identity"], compresslevel=6)
+            if brotli is not None:
+                self.content["br"] = brotli.compress(self.content["identity"], quality=6)
+
+class SnapshotStore:
+    """SQLite file keeping the last good data of every endpoint, so a fresh process can serve before its first upstream call"""
+
+    # bump whenever the shape of an endpoint's data changes, older snapshots are then ignored
+    VERSION = 2
+
+    def __init__(self, path, max_age):
+        self.path = path
+        self.max_age = max_age
+
+    def connect(self):
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS snapshots ("
+            "name TEXT PRIMARY KEY, version INTEGER NOT NULL, saved_at REAL NOT NULL, payload TEXT NOT NULL)"
+        )
+        return conn
+
+    def load(self, name):
+        if not self.path:
+            return None
+        try:
+            with closing(self.connect()) as conn:
+                row = conn.execute("SELECT version, saved_at, payload FROM snapshots WHERE name = ?", (name,)).fetchone()
+            if row is None or row[0] != self.VERSION or time.time() - row[1] > self.max_age:
+                return None
+            return row[1], json.loads(row[2])
+        except (sqlite3.Error, OSError, ValueError):
+            # a broken snapshot file only costs the warm start
+            return None
+
+    def save(self, name, data):
+        if not self.path:
+            return
+        try:
+            payload = json.dumps(data, separators=(",", ":"))
+            with closing(self.connect()) as conn, conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO snapshots (name, version, saved_at, payload) VALUES (?, ?, ?, ?)",
+                    (name, self.VERSION, time.time(), payload)
+                )
+        except (sqlite3.Error, OSError, TypeError, ValueError):
+            pass
+
+# an empty SNAPSHOT_PATH turns snapshots off, /tmp is the only writable location on serverless runtimes
+snapshot_store = SnapshotStore(
+    os.getenv("SNAPSHOT_PATH", os.path.join(tempfile.gettempdir(), "the-daily-gazette-snapshots.sqlite3")),
+    max_age=float(os.getenv("SNAPSHOT_MAX_AGE", 7 * 24 * 3600))
+)
+
+class Dataset:
+    """The last good data of one endpoint, rebuilt in the background while the old copy keeps being served"""
+
+    def __init__(self, name, builder, ttl, indexer=None, view=None):
+        self.name = name
+        self.builder = builder
+        self.ttl = ttl
+        self.indexer = indexer
+        self.view = view
+        self.body = None
+        self.built_at = None
+        self.next_refresh = 0
+        self.refreshing = None
+        self.last_error = None
+        self.source = None
+        self.snapshot_checked = False
+        self.snapshot_loading = None
+
+    @property
+    def warm(self):
+        return self.built_at is not None
+
+    def load_snapshot(self):
+        # tried once per process, concurrent callers share the attempt. None once it was tried
+        if self.snapshot_loading is None:
+            if self.snapshot_checked:
+                return None
+            self.snapshot_checked = True
+            self.snapshot_loading = asyncio.create_task(self._load_snapshot())
+        return self.snapshot_loading
+
+    async def _load_snapshot(self):
+        # reading, decoding and re-encoding a season is blocking work like a rebuild, keep it off the event loop
+        try:
+            snapshot = await asyncio.to_thread(snapshot_store.load, self.name)
+            if snapshot is None:
+                return False
+            saved_at, data = snapshot
+            body = await asyncio.to_thread(EncodedBody, data, self.indexer, self.view)
+        except Exception:
+            # a snapshot that can't be served only costs the warm start
+            return False
+        finally:
+            self.snapshot_loading = None
+        if self.warm:
+            # a rebuild finished first, its data is newer
+            return False
+        self.body = body
+        self.built_at = time.monotonic() - max(0, time.time() - saved_at)
+        self.source = "snapshot"
+        return True
+
+    def refresh(self):
+        # concurrent callers share the refresh already in flight
+        if self.refreshing is None:
+            self.refreshing = asyncio.create_task(self._refresh())
+            # failures are kept in last_error, don't let asyncio report them as unretrieved
+            self.refreshing.add_done_callback(lambda task: task.cancelled() or task.exception())
+        return self.refreshing
+
+    async def _refresh(self):
+        try:
+            clock = UpstreamClock()
+            token = build_clock.set(clock)
+            started = time.monotonic()
+            try:
+                # one clock value per build, so every step agrees on the season and date window
+                data = await self.builder(datetime.now())
+            finally:
+                build_clock.reset(token)
+            built = time.monotonic()
+            # serializing and compressing a season of games is cpu work, keep it off the event loop
+            body = await asyncio.to_thread(EncodedBody, data, self.indexer, self.view)
+            # whatever the build didn't spend waiting on upstream went into reshaping the data
+            phase_seconds.observe((self.name, "upstream"), clock.total)
+            phase_seconds.observe((self.name, "transform"), built - started - clock.total)
+            phase_seconds.observe((self.name, "serialize"), time.monotonic() - built)
+            changed = self.body is None or body.etag != self.body.etag
+            self.body = body
+            self.built_at = time.monotonic()
+            self.next_refresh = self.built_at + self.ttl * (1 - REFRESH_AHEAD)
+            self.last_error = None
+            self.source = "upstream"
+            if changed:
+                await asyncio.to_thread(snapshot_store.save, self.name, data)
+            return body
+        except Exception as err:
+            self.last_error = err
+            self.next_refresh = time.monotonic() + min(self.ttl, REFRESH_RETRY)
+            raise
+        finally:
+            self.refreshing = None
+
+    async def get(self):
+        if not self.warm:
+            loading = self.load_snapshot()
+            if loading is not None and await asyncio.shield(loading):
+                # serve the snapshot right away and revalidate it in the background
+                self.refresh()
+        if not self.warm:
+            # shielded so a disconnecting client doesn't cancel a refresh other requests are waiting on
+            return await asyncio.shield(self.refresh())
+        now = time.monotonic()
+        # next_refresh holds back the retry after a failed rebuild, so an outage isn't hammered per request
+        if now >= self.built_at + self.ttl and now >= self.next_refresh:
+            # stale-while-revalidate: serve the last good copy and rebuild in the background
+            self.refresh()
+        return self.body
+
+    def status(self):
+        return {
+            "warm": self.warm,
+            "age": round(time.monotonic() - self.built_at, 1) if self.warm else None,
+            "ttl": self.ttl,
+            "refreshing": self.refreshing is not None,
+            "source": self.source,
+            "last_error": str(self.last_error) if self.last_error else None
+        }
+
+class BackgroundRefresher:
+    """Pre-warms every registered dataset at startup and rebuilds each one just before its ttl runs out"""
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self.datasets = {}
+        self.task = None
+
+    def dataset(self, name, ttl, indexer=None, view=None):
+        def register(builder):
+            self.datasets[name] = Dataset(name, builder, ttl, indexer, view)
+            return builder
+        return register
+
+    async def get(self, name):
+        return await self.datasets[name].get()
+
+    async def run(self):
+        while True:
+            now = time.monotonic()
+            for dataset in self.datasets.values():
+                if not dataset.warm:
+                    # loads in a worker thread, the datasets' snapshots decode side by side
+                    dataset.load_snapshot()
+                if dataset.refreshing is None and now >= dataset.next_refresh:
+                    dataset.refresh()
+            await asyncio.sleep(self.interval)
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        tasks = [task for dataset in self.datasets.values() for task in (dataset.refreshing, dataset.snapshot_loading)
+                 if task is not None]
+        if self.task is not None:
+            tasks.append(self.task)
+            self.task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def status(self):
+        return {name: dataset.status() for name, dataset in self.datasets.items()}
+
+refresher = BackgroundRefresher()
+# serverless runtimes freeze the process between requests, there the datasets only revalidate on access
+BACKGROUND_REFRESH = os.getenv("BACKGROUND_REFRESH", "1") != "0"
+
+@asynccontextmanager
+async def lifespan(app):
+    for provider in UPSTREAM_PROVIDERS:
+        get_http_client(provider)
+    if BACKGROUND_REFRESH:
+        refresher.start()
+    yield
+    await asyncio.gather(*(feed.stop() for feed in live_feeds.values()))
+    await refresher.stop()
+    for client in http_clients.values():
+        await client.aclose()
+    http_clients.clear()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -17,92 +888,487 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# profiling
+# requests sending this token in an X-Profile header or ?profile= run under the stack sampler, unset turns it off
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+# profiles are written here when set, otherwise they replace the response body
+PROFILE_DIR = os.getenv("PROFILE_DIR")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", 0.005))
+
+class StackSampler:
+    """Samples one thread's python stack from a timer thread and counts the stacks in collapsed (flamegraph.pl) format
+
+    Only the event loop thread is sampled, so other requests running on the loop at the same time show up too,
+    and work handed to asyncio.to_thread shows up as the loop waiting."""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.counts = {}
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="stack-sampler", daemon=True)
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(f"{os.path.basename(frame.f_code.co_filename)}:{frame.f_code.co_name}")
+                frame = frame.f_back
+            if stack:
+                key = ";".join(reversed(stack))
+                self.counts[key] = self.counts.get(key, 0) + 1
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def collapsed(self):
+        return "".join(f"{stack} {count}\n" for stack, count in sorted(self.counts.items()))
+
+def profile_requested(request):
+    token = request.headers.get("X-Profile") or request.query_params.get("profile")
+    return token is not None and hmac.compare_digest(token.encode(), PROFILE_TOKEN.encode())
+
+async def profile_requests(request, call_next):
+    if not request.url.path.startswith("/api/") or not profile_requested(request):
+        return await call_next(request)
+
+    sampler = StackSampler(threading.get_ident(), PROFILE_INTERVAL)
+    sampler.start()
+    try:
+        response = await call_next(request)
+        if response.headers.get("content-type", "").startswith("text/event-stream"):
+            # an event stream never ends, profile the handler only
+            return response
+        # the body of a streamed response is produced while it is read, read it under the sampler too
+        content = b"".join([chunk async for chunk in response.body_iterator])
+    finally:
+        sampler.stop()
+
+    if PROFILE_DIR is None:
+        return Response(content=sampler.collapsed(), media_type="text/plain",
+                        headers={"Cache-Control": "no-cache, no-store, must-revalidate"})
+
+    path = os.path.join(PROFILE_DIR, f"{time.strftime('%Y%m%d-%H%M%S')}{request.url.path.replace('/', '_')}.collapsed")
+    with open(path, "w") as file:
+        file.write(sampler.collapsed())
+    headers = dict(response.headers)
+    headers.pop("content-length", None)
+    headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+    headers["X-Profile-File"] = path
+    return Response(content=content, status_code=response.status_code, headers=headers)
+
+# without a token the middleware isn't even installed, so unprofiled requests pay nothing
+if PROFILE_TOKEN:
+    app.middleware("http")(profile_requests)
+
+def etag_matches(request, etag):
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match or etag is None:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # weak comparison, a W/ prefix (e.g. added by a cdn) still matches
+    return etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+def representation_headers(response):
+    # shared by the 200 and the 304 standing in for it, a cache must see the same Vary on both
+    headers = {k: response.headers[k] for k in ("Cache-Control", "ETag") if k in response.headers}
+    headers["Vary"] = "Accept, Accept-Encoding"
+    return headers
+
+def not_modified(response):
+    # the client already has this version, answer without serializing the body
+    return Response(status_code=304, headers=representation_headers(response))
+
+def accepted_encodings(request):
+    # q=0 entries are kept, they refuse a coding that "*" would otherwise allow
+    accepted = {}
+    for coding in request.headers.get("Accept-Encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                pass
+        if name:
+            accepted[name.lower()] = q
+    return accepted
+
+def encoded_response(request, response, body):
+    # hot path: the bytes were prepared when the data changed, only pick the encoding the client accepts
+    accepted = accepted_encodings(request)
+    encoding = "identity"
+    for candidate in ("br", "gzip"):
+        # "*" only stands in for codings the client didn't list
+        if candidate in body.content and accepted.get(candidate, accepted.get("*", 0)) > 0:
+            encoding = candidate
+            break
+
+    headers = representation_headers(response)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body.content[encoding], media_type="application/json", headers=headers)
+
+def wants_ndjson(request, format):
+    if format:
+        return format.lower() == "ndjson"
+    return "application/x-ndjson" in request.headers.get("Accept", "")
+
+def ndjson_response(response, groups):
+    # one json document per line, sent as soon as each group is encoded
+    async def lines():
+        for group in groups:
+            yield dumps_json(group) + b"\n"
+
+    headers = {k: response.headers[k] for k in ("Cache-Control",) if k in response.headers}
+    headers["Vary"] = "Accept, Accept-Encoding"
+    return StreamingResponse(lines(), media_type="application/x-ndjson", headers=headers)
+
 @app.get("/api")
-def read_root():
+async def read_root():
     return {"Python": "on Vercel"}
 
-# get nba data
-sportsdata_url = os.getenv("SPORTSDATA_URL")
-sportsdata_apikey = os.getenv("SPORTSDATA_APIKEY")
-@app.get("/api/NBA/schedules")
-def get_schedules(response: Response):
-    # don't cache response for failed requests
+@app.get("/api/metrics")
+async def get_metrics():
+    inflight = {(provider,): 0 for provider in UPSTREAM_PROVIDERS}
+    for provider, *_ in upstream_inflight:
+        inflight[(provider,)] += 1
+    caches = {"upstream": upstream_cache.stats(), "mlb_schedule": mlb_schedule_cache.stats()}
+
+    lines = [
+        *phase_seconds.render(),
+        *upstream_seconds.render(),
+        *upstream_bytes.render(),
+        *render_series("gazette_upstream_inflight", "Upstream fetches currently running", ("provider",), inflight),
+        *render_series("gazette_rate_limit_queued", "Upstream calls waiting for a rate limit token", ("provider",),
+                       {(provider,): limiter.status()["queued"] for provider, limiter in rate_limiters.items()}),
+        *render_series("gazette_circuit_open", "1 while calls to the provider are paused", ("provider",),
+                       {(provider,): int(breaker.opened_at is not None) for provider, breaker in circuit_breakers.items()}),
+        *render_series("gazette_dataset_refreshing", "Endpoint datasets being rebuilt right now", ("endpoint",),
+                       {(name,): int(dataset.refreshing is not None) for name, dataset in refresher.datasets.items()}),
+        *render_series("gazette_live_subscribers", "Clients connected to a live score stream", ("league",),
+                       {(league,): len(feed.subscribers) for league, feed in live_feeds.items()}),
+        *render_series("gazette_cache_hits_total", "Cache lookups answered from memory", ("cache",),
+                       {(name,): stats["hits"] for name, stats in caches.items()}, kind="counter"),
+        *render_series("gazette_cache_misses_total", "Cache lookups that had to go upstream", ("cache",),
+                       {(name,): stats["misses"] for name, stats in caches.items()}, kind="counter"),
+        *render_series("gazette_cache_hit_ratio", "Share of cache lookups answered from memory", ("cache",),
+                       {(name,): round(stats["hits"] / max(1, stats["hits"] + stats["misses"]), 4)
+                       for name, stats in caches.items()}),
+    ]
+    return Response(content="\n".join(lines) + "\n", media_type="text/plain; version=0.0.4",
+                    headers={"Cache-Control": "no-cache, no-store, must-revalidate"})
+
+@app.get("/api/health/ready")
+async def get_ready(response: Response):
     response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
 
-    try:
-        season = datetime.now().year + 1
-        urlTeams = f"{sportsdata_url}/teams/{season}"
-        urlSchedules = f'{sportsdata_url}/SchedulesBasic/{season}'
-        headers = {
-            "Ocp-Apim-Subscription-Key": sportsdata_apikey
-        }
+    endpoints = refresher.status()
+    ready = all(endpoint["warm"] for endpoint in endpoints.values())
+    if not ready:
+        response.status_code = 503
 
-        result_teams = requests.get(urlTeams, headers=headers)
-        result_teams.raise_for_status()
+    return {
+        "ready": ready,
+        "endpoints": endpoints,
+        "cache": {
+            "upstream": upstream_cache.stats(),
+            "mlb_schedule": mlb_schedule_cache.stats()
+        },
+        "live": {league: feed.status() for league, feed in live_feeds.items()},
+        "rate_limits": {provider: limiter.status() for provider, limiter in rate_limiters.items()},
+        "circuits": {provider: breaker.status() for provider, breaker in circuit_breakers.items()}
+    }
 
-        result_shcedules = requests.get(urlSchedules, headers=headers)
-        result_shcedules.raise_for_status()
+# season calendar
+# every dataset build reads the clock once and passes that value down, see Dataset._refresh
+def nba_season(now):
+    # sportsdata.io names a season after the year it ends in
+    return now.year + 1
 
-        teams = result_teams.json()
-        schedules_list = result_shcedules.json()
+def soccer_season(now):
+    return now.year
 
-        games = []
-        for game in schedules_list:
-            filtered_game = {
-                "gameId": game.get('GameID'),
-                "gameDate": game.get('Day'),
-                "gameStatus": game.get('Status'),
-                "gameLabel": game.get('gameLabel') or None,
-                "homeTeam_key": game.get('HomeTeam'),
-                "homeTeam_id": game.get('HomeTeamID'),
-                "awayTeam_key": game.get('AwayTeam'),
-                "awayTeam_id": game.get('AwayTeamID'),
-                "homeTeam_score": game.get('HomeTeamScore'),
-                "awayTeam_score": game.get('AwayTeamScore'),
-                "gameTimeUTC": game.get('DateTimeUTC')
-            }
-            for t in teams:
-                if game.get("HomeTeamID") == t.get("TeamID"):
-                    filtered_game["homeTeam_name"] = t.get("Name")
-                    filtered_game["homeTeam_city"] = t.get("City")
-                    filtered_game["homeTeam_logo"] = t.get("WikipediaLogoUrl")
-                elif game.get("AwayTeamID") == t.get("TeamID"):
-                    filtered_game["awayTeam_name"] = t.get("Name")
-                    filtered_game["awayTeam_city"] = t.get("City")
-                    filtered_game["awayTeam_logo"] = t.get("WikipediaLogoUrl")
-
-            games.append(filtered_game)
-        
-        schedules = []
-        for date, games_group in groupby(games, key=lambda x:x["gameDate"]):
-            schedules.append({
-                "date": date,
-                "gamesList": list(games_group)
-            })
+def mlb_season(now):
+    return now.year
 
-         # cache response for successful request
-        response.headers["Cache-Control"] = 'public, max-age=3600, s-maxage=86400, stale-while-revalidate=1800'
+def mlb_parse_season(result):
+    # statsapi returns no season until it is announced
+    season = (result.get("seasons") or [{}])[0]
+    return {
+        "start": datetime.strptime(season["seasonStartDate"], "%Y-%m-%d").date() if season.get("seasonStartDate") else None,
+        "end": datetime.strptime(season["seasonEndDate"], "%Y-%m-%d").date() if season.get("seasonEndDate") else None
+    }
 
+async def mlb_get_season(season_id):
+    # start/end dates parsed once per fetch and cached with the "seasons" ttl
+    return await fetch_json("statsapi", f"{MLB_STATSAPI_URL}/seasons/{season_id}", params={"sportId": 1},
+                            resource="seasons", transform=mlb_parse_season)
+
+async def mlb_schedule_window(now):
+    today = now.date()
+    current_season, next_season = await asyncio.gather(
+        mlb_get_season(mlb_season(now)),
+        mlb_get_season(mlb_season(now) + 1)
+    )
+    # season hasn't ended yet, or the next one already started: show the games around today
+    if today < current_season["end"] or (next_season["start"] and today >= next_season["start"]):
+        return today - timedelta(days=10), today + timedelta(days=10)
+    # if season ended we want to show the last played games
+    return current_season["end"] - timedelta(days=10), current_season["end"]
+
+# schedule filtering
+def normalize_status(status):
+    return "".join(ch for ch in (status or "").lower() if ch.isalnum())
+
+class ScheduleIndex:
+    """Games of a schedule dataset sorted by date, with posting lists per team and status, so filters never scan the season"""
+
+    def __init__(self, schedules):
+        games = [(group["date"], game) for group in schedules for game in group["gamesList"]]
+        # stable, games of the same date keep their order
+        # undated games (e.g. postponed without a new date) sort first under "", only unbounded ranges return them
+        games.sort(key=lambda entry: (entry[0] or "")[:10])
+        self.group_dates = [group_date for group_date, _ in games]
+        self.games = [game for _, game in games]
+        self.days = [(group_date or "")[:10] for group_date in self.group_dates]
+        self.statuses = [normalize_status(game.get("gameStatus")) for game in self.games]
+
+        # team id or key -> ascending positions into self.games
+        self.by_team = {}
+        for pos, game in enumerate(self.games):
+            keys = set()
+            for side in ("homeTeam", "awayTeam"):
+                if game.get(f"{side}_id") is not None:
+                    keys.add(str(game[f"{side}_id"]))
+                if game.get(f"{side}_key"):
+                    keys.add(str(game[f"{side}_key"]).upper())
+            for key in keys:
+                self.by_team.setdefault(key, []).append(pos)
+
+    def positions(self, date_from=None, date_to=None, team=None):
+        lo = bisect.bisect_left(self.days, date_from) if date_from else 0
+        hi = bisect.bisect_right(self.days, date_to) if date_to else len(self.days)
+        if team is None:
+            return range(lo, hi)
+        postings = self.by_team.get(team.upper(), [])
+        return postings[bisect.bisect_left(postings, lo):bisect.bisect_left(postings, hi)]
+
+    def team_schedule(self, team, today, last=5, upcoming=5):
+        # the team's posting list is already in date order, split it at today's first game
+        postings = self.by_team.get(team.upper())
+        if postings is None:
+            return None
+        split = bisect.bisect_left(postings, bisect.bisect_left(self.days, today))
         return {
-            "ok": True,
-            "error": None,
-            "data": schedules
+            "last": [self.games[pos] for pos in postings[max(0, split - last):split]],
+            "next": [self.games[pos] for pos in postings[split:split + upcoming]]
+        }
+
+    def groups(self, date_from=None, date_to=None, team=None, status=None):
+        # yields one {"date", "gamesList"} group at a time, so streaming never holds the whole season
+        status = normalize_status(status) if status else None
+        group = None
+        for pos in self.positions(date_from, date_to, team):
+            if status and self.statuses[pos] != status:
+                continue
+            if group and group["date"] == self.group_dates[pos]:
+                group["gamesList"].append(self.games[pos])
+            else:
+                if group:
+                    yield group
+                group = {
+                    "date": self.group_dates[pos],
+                    "gamesList": [self.games[pos]]
+                }
+        if group:
+            yield group
+
+    def filter(self, date_from=None, date_to=None, team=None, status=None):
+        return list(self.groups(date_from, date_to, team, status))
+
+def parse_schedule_filters(date_from, date_to, team, status):
+    # returns the ScheduleIndex.filter() options, or raises ValueError with a message for the client
+    filters = {}
+    for name, value in (("date_from", date_from), ("date_to", date_to)):
+        if value:
+            try:
+                filters[name] = datetime.strptime(value, "%Y-%m-%d").date().isoformat()
+            except ValueError:
+                raise ValueError(f"{'from' if name == 'date_from' else 'to'} must be a YYYY-MM-DD date")
+    if team:
+        filters["team"] = team
+    if status:
+        filters["status"] = status
+    return filters
+
+# live scores
+# seconds between live polls, the schedules upstream cache keeps a response for CACHE_TTL["schedules"] anyway
+LIVE_POLL_INTERVAL = float(os.getenv("LIVE_POLL_INTERVAL", 30))
+# a comment line this often keeps proxies from closing an idle stream
+LIVE_KEEPALIVE = 15
+# a subscriber that falls this many updates behind is dropped, its EventSource reconnects with a fresh snapshot
+LIVE_QUEUE_SIZE = 32
+
+def live_state(game):
+    return (game.get("gameStatus"), game.get("homeTeam_score"), game.get("awayTeam_score"))
+
+class LiveFeed:
+    """One schedule poller per league shared by every subscriber, pushing only the games whose score or status changed"""
+
+    def __init__(self, league, interval):
+        self.league = league
+        self.interval = interval
+        self.subscribers = set()
+        self.states = {}
+        self.task = None
+        self.last_error = None
+
+    @property
+    def dataset(self):
+        return refresher.datasets[f"{self.league}/schedules"]
+
+    def subscribe(self, games):
+        queue = asyncio.Queue(maxsize=LIVE_QUEUE_SIZE)
+        self.subscribers.add(queue)
+        if self.task is None:
+            # first subscriber, diff against the copy its snapshot comes from
+            self.changes(games)
+            self.task = asyncio.create_task(self.run())
+        return queue
+
+    def unsubscribe(self, queue):
+        self.subscribers.discard(queue)
+        # nobody is watching, stop polling upstream
+        if not self.subscribers and self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    def changes(self, games):
+        changed = []
+        for game in games:
+            state = live_state(game)
+            if self.states.get(game.get("gameId"), state) != state:
+                changed.append(game)
+            self.states[game.get("gameId")] = state
+        return changed
+
+    def publish(self, games):
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(games)
+            except asyncio.QueueFull:
+                self.subscribers.discard(queue)
+
+    async def poll(self):
+        dataset = self.dataset
+        # the schedules route may have rebuilt the dataset recently, reuse that copy
+        if not dataset.warm or time.monotonic() - dataset.built_at >= self.interval:
+            await asyncio.shield(dataset.refresh())
+        changed = self.changes(dataset.body.index.games)
+        if changed:
+            self.publish(changed)
+
+    async def run(self):
+        while True:
+            try:
+                await self.poll()
+                self.last_error = None
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                # keep the last known states, the next poll retries
+                self.last_error = err
+            await asyncio.sleep(self.interval)
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    def status(self):
+        return {
+            "subscribers": len(self.subscribers),
+            "polling": self.task is not None,
+            "last_error": str(self.last_error) if self.last_error else None
+        }
+
+live_feeds = {league: LiveFeed(league, LIVE_POLL_INTERVAL) for league in ("NBA", "MLB", "SOCCER")}
+
+def sse_event(event, data):
+    return b"event: " + event.encode() + b"\ndata: " + dumps_json(data) + b"\n\n"
+
+async def live_events(feed, queue, snapshot):
+    try:
+        yield b"retry: 5000\n\n"
+        yield sse_event("snapshot", snapshot)
+        while True:
+            try:
+                games = await asyncio.wait_for(queue.get(), LIVE_KEEPALIVE)
+            except TimeoutError:
+                if queue not in feed.subscribers:
+                    return
+                yield b": keepalive\n\n"
+                continue
+            yield sse_event("update", games)
+            if queue not in feed.subscribers:
+                # fell too far behind, end the stream so the client reconnects with a fresh snapshot
+                return
+    finally:
+        feed.unsubscribe(queue)
+
+@app.get("/api/{league}/live")
+async def get_live_scores(response: Response, league: str):
+    # an event stream is never cacheable
+    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+
+    feed = live_feeds.get(league.upper())
+    if feed is None:
+        response.status_code = 404
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Unknown league: {league.upper()}"
         }
 
-    except HTTPError as err_http:
+    try:
+        body = await refresher.get(f"{feed.league}/schedules")
+        # subscribe before reading the snapshot, so no change between the two is missed
+        queue = feed.subscribe(body.index.games)
+        today = datetime.now().date().isoformat()
+        snapshot = body.index.filter(date_from=today, date_to=today)
+
+        headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        return StreamingResponse(live_events(feed, queue, snapshot), media_type="text/event-stream", headers=headers)
+
+    except HTTPStatusError as err_http:
         response.status_code = err_http.response.status_code if err_http.response.status_code in range(400, 500) else 502
         return {
             "ok": False,
             "data": None,
             "error": f"External API Error ({err_http.response.status_code}): {err_http}"
         }
-    except ConnectionError as err_conn:
+    except TransportError as err_conn:
         response.status_code = 504
         return {
             "ok": False,
             "data": None,
             "error": f"Connection Error: {err_conn}"
         }
+    except TimeoutError:
+        response.status_code = 504
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Upstream deadline of {UPSTREAM_DEADLINE}s exceeded"
+        }
     except Exception as err:
         response.status_code = 500
         return {
@@ -111,82 +1377,74 @@ def get_schedules(response: Response):
             "error": f"Internal Server Error: {str(err)}"
         }
 
-@app.get("/api/NBA/standings")
-def get_standings(response: Response):
+@app.get("/api/{league}/teams/{team_id}/schedule")
+async def get_team_schedule(response: Response, league: str, team_id: str, last: int = 5,
+                            upcoming: int = Query(5, alias="next")):
     # don't cache response for failed requests
     response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
 
+    league = league.upper()
+    if league not in ("NBA", "MLB", "SOCCER"):
+        response.status_code = 404
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Unknown league: {league}"
+        }
+    if not (0 <= last <= 100 and 0 <= upcoming <= 100):
+        response.status_code = 400
+        return {
+            "ok": False,
+            "data": None,
+            "error": "last and next must be between 0 and 100"
+        }
+
     try:
-        season = datetime.now().year + 1
-        urlTeams = f"{sportsdata_url}/teams/{season}"
-        urlStandings = f"{sportsdata_url}/Standings/{season}"
-        headers = {
-            "Ocp-Apim-Subscription-Key": sportsdata_apikey
-        }
-
-        result_teams = requests.get(urlTeams, headers=headers)
-        result_teams.raise_for_status()
-
-        result_standings = requests.get(urlStandings, headers=headers)
-        result_standings.raise_for_status()
-
-        teams = result_teams.json()
-        standings = result_standings.json()
-
-        grouped = { 'east': [], 'west': []}
-        for team in standings:
-            conference = team.get("Conference").lower()
-            filtered_team_records = {
-                "team_id": team.get('TeamID'),
-                "team_name": team.get('Name'),
-                "team_city": team.get('City'),
-                "team_key": team.get('Key'),
-                "wins": team.get('Wins'),
-                "losses": team.get('Losses'),
-                "winpct": team.get('Percentage'),
-                "home": f"{team.get('HomeWins')}-{team.get("HomeLosses")}",
-                "road": f"{team.get('AwayWins')}-{team.get("AwayLosses")}",
-                "lastTen": f"{team.get('LastTenWins')}-{team.get("LastTenLosses")}",
-                "conference": conference,
-                "conferenceGamesBack": team.get('GamesBack'),
-                "consferenceRecord": f"{team.get('ConferenceWins')}-{team.get("ConferenceLosses")}",
-                "currentStreak": team.get('StreakDescription'),
+        body = await refresher.get(f"{league}/schedules")
+        # today's games count as upcoming until the next day
+        team_schedule = body.index.team_schedule(team_id, datetime.now().date().isoformat(), last, upcoming)
+        if team_schedule is None:
+            response.status_code = 404
+            return {
+                "ok": False,
+                "data": None,
+                "error": f"No {league} games found for team {team_id}"
             }
-            for t in teams:
-                if t.get("TeamID") == team.get("TeamID"):
-                    filtered_team_records["team_logo"] = t.get('WikipediaLogoUrl')
-
-            if conference == 'eastern':
-                grouped["east"].append(filtered_team_records)
-            else:
-                grouped["west"].append(filtered_team_records)
-            
-        grouped["east"] = sorted(grouped["east"], key=lambda x: x["winpct"], reverse=True)
-        grouped["west"] = sorted(grouped["west"], key=lambda x: x["winpct"], reverse=True)
 
         # cache response for successful request
         response.headers["Cache-Control"] = 'public, max-age=300, s-maxage=3600, stale-while-revalidate=1800'
 
         return {
             "ok": True,
-            "error":None,
-            "data": grouped
+            "error": None,
+            "data": {
+                "team_id": team_id,
+                "last": team_schedule["last"],
+                "next": team_schedule["next"]
+            }
         }
 
-    except HTTPError as err_http:
+    except HTTPStatusError as err_http:
         response.status_code = err_http.response.status_code if err_http.response.status_code in range(400, 500) else 502
         return {
             "ok": False,
             "data": None,
             "error": f"External API Error ({err_http.response.status_code}): {err_http}"
         }
-    except ConnectionError as err_conn:
+    except TransportError as err_conn:
         response.status_code = 504
         return {
             "ok": False,
             "data": None,
             "error": f"Connection Error: {err_conn}"
         }
+    except TimeoutError:
+        response.status_code = 504
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Upstream deadline of {UPSTREAM_DEADLINE}s exceeded"
+        }
     except Exception as err:
         response.status_code = 500
         return {
@@ -194,32 +1452,267 @@ def get_standings(response: Response):
             "data": None,
             "error": f"Internal Server Error: {str(err)}"
         }
-    
-@app.get("/api/NBA/players")
-def get_players(response: Response):
+
+# get nba data
+sportsdata_url = os.getenv("SPORTSDATA_URL")
+sportsdata_apikey = os.getenv("SPORTSDATA_APIKEY")
+# season stats live under the stats api, not the scores api of sportsdata_url
+sportsdata_stats_url = os.getenv("SPORTSDATA_STATS_URL", "https://api.sportsdata.io/v3/nba/stats/json")
+
+async def nba_get_teams(season):
+    # team directory indexed by TeamID
+    return await fetch_json("sportsdata", f"{sportsdata_url}/teams/{season}", resource="teams", transform=index_by("TeamID"))
+
+# the SchedulesBasic fields build_nba_schedules projects
+NBAGame = record("NBAGame", {
+    "GameID": int | None,
+    "Day": str | None,
+    "Status": str | None,
+    "gameLabel": str | None,
+    "HomeTeam": str | None,
+    "HomeTeamID": int | None,
+    "AwayTeam": str | None,
+    "AwayTeamID": int | None,
+    "HomeTeamScore": int | None,
+    "AwayTeamScore": int | None,
+    "DateTimeUTC": str | None,
+})
+
+@refresher.dataset("NBA/schedules", ttl=DATASET_TTL["schedules"], indexer=ScheduleIndex)
+async def build_nba_schedules(now):
+    season = nba_season(now)
+    urlSchedules = f'{sportsdata_url}/SchedulesBasic/{season}'
+
+    teams, schedules_list = await gather_with_deadline(
+        nba_get_teams(season),
+        fetch_json("sportsdata", urlSchedules, resource="schedules", schema=list[NBAGame])
+    )
+
+    games = []
+    for game in schedules_list:
+        filtered_game = {
+            "gameId": game.GameID,
+            "gameDate": game.Day,
+            "gameStatus": game.Status,
+            "gameLabel": game.gameLabel or None,
+            "homeTeam_key": game.HomeTeam,
+            "homeTeam_id": game.HomeTeamID,
+            "awayTeam_key": game.AwayTeam,
+            "awayTeam_id": game.AwayTeamID,
+            "homeTeam_score": game.HomeTeamScore,
+            "awayTeam_score": game.AwayTeamScore,
+            "gameTimeUTC": game.DateTimeUTC
+        }
+        home_team = teams.get(game.HomeTeamID)
+        if home_team:
+            filtered_game["homeTeam_name"] = home_team.get("Name")
+            filtered_game["homeTeam_city"] = home_team.get("City")
+            filtered_game["homeTeam_logo"] = home_team.get("WikipediaLogoUrl")
+        away_team = teams.get(game.AwayTeamID)
+        if away_team:
+            filtered_game["awayTeam_name"] = away_team.get("Name")
+            filtered_game["awayTeam_city"] = away_team.get("City")
+            filtered_game["awayTeam_logo"] = away_team.get("WikipediaLogoUrl")
+
+        games.append(filtered_game)
+
+    schedules = []
+    for date, games_group in groupby(games, key=lambda x:x["gameDate"]):
+        schedules.append({
+            "date": date,
+            "gamesList": list(games_group)
+        })
+
+    return schedules
+
+@app.get("/api/NBA/schedules")
+async def get_schedules(request: Request, response: Response, date_from: str | None = Query(None, alias="from"),
+                        date_to: str | None = Query(None, alias="to"), team: str | None = None, status: str | None = None,
+                        format: str | None = None):
     # don't cache response for failed requests
     response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
 
     try:
-        season = datetime.now().year + 1
-        urlTeams = f"{sportsdata_url}/teams/{season}"
-        urlPlayersStats = f"https://api.sportsdata.io/v3/nba/stats/json/PlayerSeasonStats/{season}"
-        headers = {
-            "Ocp-Apim-Subscription-Key": sportsdata_apikey
+        filters = parse_schedule_filters(date_from, date_to, team, status)
+    except ValueError as err:
+        response.status_code = 400
+        return {
+            "ok": False,
+            "data": None,
+            "error": str(err)
         }
 
-        result_teams = requests.get(urlTeams, headers=headers)
-        result_teams.raise_for_status()
+    try:
+        body = await refresher.get("NBA/schedules")
+
+        # cache response for successful request
+        response.headers["Cache-Control"] = 'public, max-age=3600, s-maxage=86400, stale-while-revalidate=1800'
+        if wants_ndjson(request, format):
+            # one date group per line, streamed straight off the index
+            return ndjson_response(response, body.index.groups(**filters))
+        if filters:
+            # json or ndjson depending on Accept, caches must key on it like the unfiltered response
+            response.headers["Vary"] = "Accept, Accept-Encoding"
+            # answered from the dataset's date/team index, never from a scan of the season
+            return {
+                "ok": True,
+                "error": None,
+                "data": body.index.filter(**filters)
+            }
+
+        response.headers["ETag"] = body.etag
+        if etag_matches(request, body.etag):
+            return not_modified(response)
+
+        return encoded_response(request, response, body)
+
+    except HTTPStatusError as err_http:
+        response.status_code = err_http.response.status_code if err_http.response.status_code in range(400, 500) else 502
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"External API Error ({err_http.response.status_code}): {err_http}"
+        }
+    except TransportError as err_conn:
+        response.status_code = 504
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Connection Error: {err_conn}"
+        }
+    except TimeoutError:
+        response.status_code = 504
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Upstream deadline of {UPSTREAM_DEADLINE}s exceeded"
+        }
+    except Exception as err:
+        response.status_code = 500
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Internal Server Error: {str(err)}"
+        }
+
+@refresher.dataset("NBA/standings", ttl=DATASET_TTL["standings"])
+async def build_nba_standings(now):
+    season = nba_season(now)
+    urlStandings = f"{sportsdata_url}/Standings/{season}"
+
+    teams, standings = await gather_with_deadline(
+        nba_get_teams(season),
+        fetch_json("sportsdata", urlStandings, resource="standings")
+    )
+
+    grouped = { 'east': [], 'west': []}
+    for team in standings:
+        conference = team.get("Conference").lower()
+        filtered_team_records = {
+            "team_id": team.get('TeamID'),
+            "team_name": team.get('Name'),
+            "team_city": team.get('City'),
+            "team_key": team.get('Key'),
+            "wins": team.get('Wins'),
+            "losses": team.get('Losses'),
+            "winpct": team.get('Percentage'),
+            "home": f"{team.get('HomeWins')}-{team.get('HomeLosses')}",
+            "road": f"{team.get('AwayWins')}-{team.get('AwayLosses')}",
+            "lastTen": f"{team.get('LastTenWins')}-{team.get('LastTenLosses')}",
+            "conference": conference,
+            "conferenceGamesBack": team.get('GamesBack'),
+            "consferenceRecord": f"{team.get('ConferenceWins')}-{team.get('ConferenceLosses')}",
+            "currentStreak": team.get('StreakDescription'),
+        }
+        t = teams.get(team.get("TeamID"))
+        if t:
+            filtered_team_records["team_logo"] = t.get('WikipediaLogoUrl')
 
-        result_players_stats = requests.get(urlPlayersStats, headers=headers)
-        result_players_stats.raise_for_status()
+        if conference == 'eastern':
+            grouped["east"].append(filtered_team_records)
+        else:
+            grouped["west"].append(filtered_team_records)
 
-        teams = result_teams.json()
-        playersStats = result_players_stats.json()
+    grouped["east"] = sorted(grouped["east"], key=lambda x: x["winpct"], reverse=True)
+    grouped["west"] = sorted(grouped["west"], key=lambda x: x["winpct"], reverse=True)
 
-        players_list = []
-        for player in playersStats:
-            filtered_player_stats = {
+    return grouped
+
+@app.get("/api/NBA/standings")
+async def get_standings(request: Request, response: Response):
+    # don't cache response for failed requests
+    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+
+    try:
+        body = await refresher.get("NBA/standings")
+
+        # cache response for successful request
+        response.headers["Cache-Control"] = 'public, max-age=300, s-maxage=3600, stale-while-revalidate=1800'
+        response.headers["ETag"] = body.etag
+        if etag_matches(request, body.etag):
+            return not_modified(response)
+
+        return encoded_response(request, response, body)
+
+    except HTTPStatusError as err_http:
+        response.status_code = err_http.response.status_code if err_http.response.status_code in range(400, 500) else 502
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"External API Error ({err_http.response.status_code}): {err_http}"
+        }
+    except TransportError as err_conn:
+        response.status_code = 504
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Connection Error: {err_conn}"
+        }
+    except TimeoutError:
+        response.status_code = 504
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Upstream deadline of {UPSTREAM_DEADLINE}s exceeded"
+        }
+    except Exception as err:
+        response.status_code = 500
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Internal Server Error: {str(err)}"
+        }
+    
+# default NBA players leaderboard
+NBA_TOP_PLAYERS = 30
+NBA_RANKING_WEIGHTS = {
+    "fantasy_points": 0.70,
+    "per": 0.20,
+    "plus_minus": 0.10,
+}
+
+class NBAPlayerStats:
+    """Season stats of every NBA player, the numbers kept as numpy columns so any leaderboard is a few vectorized ops"""
+
+    COLUMNS = ("fantasy_points", "per", "plus_minus", "points", "rebounds", "assists", "steals")
+
+    def __init__(self, players):
+        # projected rows are kept for the response, the columns are only used for ranking
+        self.players = players
+        self.columns = {
+            name: np.array([float(player[name] or 0) for player in players], dtype=np.float64)
+            for name in self.COLUMNS
+        }
+        self.positions = np.array([(player["player_position"] or "").upper() for player in players], dtype=object)
+        self.team_keys = np.array([(player["team_key"] or "").upper() for player in players], dtype=object)
+        self.team_ids = np.array([player["team_id"] if player["team_id"] is not None else -1 for player in players], dtype=np.int64)
+
+    @classmethod
+    async def from_stream(cls, playersStats):
+        # only the needed fields of each row are kept while the upstream array streams in
+        players = []
+        async for player in playersStats:
+            players.append({
                 "player_id": player.get("PlayerID"),
                 "player_name": player.get("Name"),
                 "player_position": player.get("Position"),
@@ -232,51 +1725,155 @@ def get_players(response: Response):
                 "points": player.get("Points"),
                 "per": player.get("PlayerEfficiencyRating"),
                 "plus_minus": player.get("PlusMinus"),
+            })
+        return cls(players)
+
+    def rank(self, weights=NBA_RANKING_WEIGHTS, sort=None, position=None, team=None, limit=NBA_TOP_PLAYERS):
+        if sort is not None:
+            scores = self.columns[sort]
+        else:
+            scores = sum(weight * self.columns[name] for name, weight in weights.items())
+
+        mask = np.ones(len(self.players), dtype=bool)
+        if position:
+            mask &= self.positions == position.upper()
+        if team:
+            mask &= (self.team_keys == team.upper()) | (self.team_ids == int(team) if team.isdigit() else False)
+
+        # stable sort on the negated scores, ties keep the upstream order
+        candidates = np.flatnonzero(mask)
+        order = candidates[np.argsort(-scores[candidates], kind="stable")][:limit]
+        return [dict(self.players[i], player_points=float(scores[i])) for i in order]
+
+def nba_parse_ranking(weights, sort, limit):
+    # returns the rank() options, or raises ValueError with a message for the client
+    options = {}
+    if sort is not None:
+        if sort not in NBAPlayerStats.COLUMNS:
+            raise ValueError(f"sort must be one of {', '.join(NBAPlayerStats.COLUMNS)}")
+        options["sort"] = sort
+    if weights is not None:
+        parsed = {}
+        for pair in weights.split(","):
+            name, _, weight = pair.partition(":")
+            if name.strip() not in NBAPlayerStats.COLUMNS:
+                raise ValueError(f"weights must be column:weight pairs using {', '.join(NBAPlayerStats.COLUMNS)}")
+            try:
+                parsed[name.strip()] = float(weight)
+            except ValueError:
+                raise ValueError(f"invalid weight for {name.strip()}: {weight!r}")
+        options["weights"] = parsed
+    if limit is not None:
+        if not 1 <= limit <= 500:
+            raise ValueError("limit must be between 1 and 500")
+        options["limit"] = limit
+    return options
+
+async def nba_get_player_stats(season):
+    urlPlayersStats = f"{sportsdata_stats_url}/PlayerSeasonStats/{season}"
+    return await fetch_json("sportsdata", urlPlayersStats, resource="players", transform=NBAPlayerStats.from_stream, stream=True)
+
+def nba_rank_players(player_stats, teams, **options):
+    players_list = player_stats.rank(**options)
+
+    # only the ranked players get the team data
+    for player in players_list:
+        team = teams.get(player.get("team_id"))
+        if team:
+            player["team_name"] = team.get('Name')
+            player["team_city"] = team.get('City')
+            player["team_logo"] = team.get('WikipediaLogoUrl')
+
+    return players_list
+
+# team fields the leaderboards show, the rest of the directory isn't kept on the dataset
+NBA_LEADERBOARD_TEAM_FIELDS = ("TeamID", "Name", "City", "WikipediaLogoUrl")
+
+class NBAPlayerIndex:
+    """Season stats and team directory of the NBA/players dataset, every leaderboard is ranked from it"""
+
+    def __init__(self, data):
+        self.stats = NBAPlayerStats(data["players"])
+        self.teams = index_by("TeamID")(data["teams"])
+
+    def leaderboard(self, **options):
+        return nba_rank_players(self.stats, self.teams, **options)
+
+@refresher.dataset("NBA/players", ttl=DATASET_TTL["players"], indexer=NBAPlayerIndex,
+                   view=lambda index: index.leaderboard())
+async def build_nba_players(now):
+    season = nba_season(now)
+
+    teams, player_stats = await gather_with_deadline(
+        nba_get_teams(season),
+        nba_get_player_stats(season)
+    )
+
+    # every player is kept so custom leaderboards are served from the dataset too, the endpoint encodes the default one
+    return {
+        "players": player_stats.players,
+        "teams": [{k: team.get(k) for k in NBA_LEADERBOARD_TEAM_FIELDS} for team in teams.values()]
+    }
+
+@app.get("/api/NBA/players")
+async def get_players(request: Request, response: Response, weights: str | None = None, sort: str | None = None,
+                      position: str | None = None, team: str | None = None, limit: int | None = None):
+    # don't cache response for failed requests
+    response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
+
+    try:
+        options = nba_parse_ranking(weights, sort, limit)
+    except ValueError as err:
+        response.status_code = 400
+        return {
+            "ok": False,
+            "data": None,
+            "error": str(err)
+        }
+
+    try:
+        body = await refresher.get("NBA/players")
+
+        if options or position or team:
+            # custom leaderboard ranked from the same warm copy of the season stats as the default one
+            players_list = body.index.leaderboard(position=position, team=team, **options)
+
+            response.headers["Cache-Control"] = 'public, max-age=3600, s-maxage=86400, stale-while-revalidate=1800'
+            return {
+                "ok": True,
+                "error": None,
+                "data": players_list
             }
-            players_list.append(filtered_player_stats)
-
-        def get_weighted_stats(player):
-            return (
-                0.70 * float(player.get("fantasy_points") or 0) +
-                0.20 * float(player.get("per") or 0) +
-                0.10 * float(player.get("plus_minus") or 0)
-            )
-        
-        for player in players_list:
-            player["player_points"] = get_weighted_stats(player)
-
-        players_list = sorted(players_list, key=lambda x: x['player_points'], reverse=True)[:30]
-
-        for player in players_list:
-            for team in teams:
-                if team.get("TeamID") == player.get("team_id"):
-                    player["team_name"] = team.get('Name')
-                    player["team_city"] = team.get('City')
-                    player["team_logo"] = team.get('WikipediaLogoUrl')
 
         # cache response for successful request
         response.headers["Cache-Control"] = 'public, max-age=3600, s-maxage=86400, stale-while-revalidate=1800'
+        response.headers["ETag"] = body.etag
+        if etag_matches(request, body.etag):
+            return not_modified(response)
 
-        return {
-            "ok": True,
-            "error": None,
-            "data": players_list,
-        }
+        return encoded_response(request, response, body)
     
-    except HTTPError as err_http:
+    except HTTPStatusError as err_http:
         response.status_code = err_http.response.status_code if err_http.response.status_code in range(400, 500) else 502
         return {
             "ok": False,
             "data": None,
             "error": f"External API Error ({err_http.response.status_code}): {err_http}"
         }
-    except ConnectionError as err_conn:
+    except TransportError as err_conn:
         response.status_code = 504
         return {
             "ok": False,
             "data": None,
             "error": f"Connection Error: {err_conn}"
         }
+    except TimeoutError:
+        response.status_code = 504
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Upstream deadline of {UPSTREAM_DEADLINE}s exceeded"
+        }
     except Exception as err:
         response.status_code = 500
         return {
@@ -286,215 +1883,357 @@ def get_players(response: Response):
         }
 
 # get mlb data
+# mlbstatsapi only offers blocking calls, so the same statsapi.mlb.com endpoints are queried through the pooled client
+# games per date. final past dates never change and upcoming ones rarely do,
+# only yesterday and today carry live games and get refetched often
+MLB_SCHEDULE_TTL = {
+    "final": 30 * 24 * 3600,
+    "upcoming": 6 * 3600,
+    "live": CACHE_TTL["schedules"],
+}
+mlb_schedule_cache = TTLCache(maxsize=512)
+
+def mlb_schedule_date_ttl(game_day, games, today):
+    if today - timedelta(days=1) <= game_day <= today:
+        return MLB_SCHEDULE_TTL["live"]
+    if game_day < today and all(game["status"].get("abstractGameState") == "Final" for game in games):
+        return MLB_SCHEDULE_TTL["final"]
+    return MLB_SCHEDULE_TTL["upcoming"]
+
+async def mlb_get_schedule(start_day, end_day, today):
+    game_days = [start_day + timedelta(days=i) for i in range((end_day - start_day).days + 1)]
+
+    games_by_day = {game_day: mlb_schedule_cache.get(game_day) for game_day in game_days}
+    # group the dates missing from the cache into contiguous ranges, one upstream call each
+    ranges = []
+    for game_day in game_days:
+        if games_by_day[game_day] is not TTLCache.MISSING:
+            continue
+        if ranges and ranges[-1][1] == game_day - timedelta(days=1):
+            ranges[-1][1] = game_day
+        else:
+            ranges.append([game_day, game_day])
+
+    results = await asyncio.gather(*(
+        fetch_json("statsapi", f"{MLB_STATSAPI_URL}/schedule", params={
+            "sportId": 1,
+            "startDate": range_start.isoformat(),
+            "endDate": range_end.isoformat()
+        }, priority=RESOURCE_PRIORITY["schedules"])
+        for range_start, range_end in ranges
+    ))
+
+    for (range_start, range_end), result in zip(ranges, results):
+        fetched = {date["date"]: date.get("games", []) for date in result.get("dates", [])}
+        game_day = range_start
+        while game_day <= range_end:
+            # statsapi leaves out dates without games, those are cached as empty
+            games = fetched.get(game_day.isoformat(), [])
+            mlb_schedule_cache.set(game_day, games, mlb_schedule_date_ttl(game_day, games, today))
+            games_by_day[game_day] = games
+            game_day += timedelta(days=1)
+
+    return {
+        "dates": [
+            {"date": game_day.isoformat(), "games": games_by_day[game_day]}
+            for game_day in game_days if games_by_day[game_day]
+        ]
+    }
+
+async def mlb_get_teams(season):
+    params = {
+        "sportId": 1,
+        "season": season
+    }
+    # team directory indexed by team id
+    return await fetch_json("statsapi", f"{MLB_STATSAPI_URL}/teams", params=params, resource="teams",
+                            transform=lambda result: index_by("id")(result.get("teams", [])))
+
+async def mlb_get_people(season, person_ids):
+    # only the requested people in one batched call, indexed by person id
+    params = {
+        "personIds": ",".join(str(person_id) for person_id in sorted(set(person_ids))),
+        "season": season,
+        # unlike sports/1/players, people only includes the current team when it is hydrated
+        "hydrate": "currentTeam"
+    }
+    if not params["personIds"]:
+        return {}
+    return await fetch_json("statsapi", f"{MLB_STATSAPI_URL}/people", params=params, resource="players",
+                            transform=lambda result: index_by("id")(result.get("people", [])))
+
+async def mlb_get_current_schedule(now):
+    start_date, end_date = await mlb_schedule_window(now)
+    return await mlb_get_schedule(start_date, end_date, now.date())
+
+@refresher.dataset("MLB/schedules", ttl=DATASET_TTL["schedules"], indexer=ScheduleIndex)
+async def build_mlb_schedules(now):
+    current_year_season = mlb_season(now)
+
+    # the schedule window depends on the season dates, the team list doesn't
+    mlb_schedule, mlb_teams = await gather_with_deadline(
+        mlb_get_current_schedule(now),
+        mlb_get_teams(current_year_season)
+    )
+
+    schedules = []
+    # create an array of games per date
+    for date in mlb_schedule.get("dates", []):
+        game_day = date["date"]
+        game_list = []
+        # map the props of the game appended to list
+        for game in date.get("games", []):
+            home = game["teams"]["home"]
+            away = game["teams"]["away"]
+            filtered_game = {
+                "gameId": game.get("gameGuid"),
+                "gameDate": game.get("gameDate"),
+                "gameTimeUTC": game.get("gameDate"),
+                "gamepk": game.get("gamePk"),
+                "gameStatus": game["status"].get("detailedState"),
+                "gameLabel": game.get("seriesDescription"),
+                "homeTeam_name": home["team"].get("name"),
+                "homeTeam_id": home["team"].get("id"),
+                "awayTeam_name": away["team"].get("name"),
+                "awayTeam_id": away["team"].get("id"),
+                "homeTeam_score": home.get("score"),
+                "awayTeam_score": away.get("score"),
+                "homeTeam_seriesRecord": home.get("leagueRecord"),
+                "awayTeam_seriesRecord": away.get("leagueRecord")
+            }
+            home_team = mlb_teams.get(home["team"].get("id"))
+            if home_team:
+                filtered_game["homeTeam_key"] = home_team.get("abbreviation")
+                filtered_game["homeTeam_city"] = home_team.get("locationName")
+                filtered_game["homeTeam_clubname"] = home_team.get("clubName")
+            away_team = mlb_teams.get(away["team"].get("id"))
+            if away_team:
+                filtered_game["awayTeam_key"] = away_team.get("abbreviation")
+                filtered_game["awayTeam_city"] = away_team.get("locationName")
+                filtered_game["awayTeam_clubname"] = away_team.get("clubName")
+
+            game_list.append(filtered_game)
+
+        schedules.append({
+            "date": game_day,
+            "gamesList": game_list
+        })
+    # sort using the date
+    schedules.sort(key=lambda x: x["date"])
+
+    return schedules
+
 @app.get("/api/MLB/schedules")
-def get_schedules(response: Response):
+async def get_schedules(request: Request, response: Response, date_from: str | None = Query(None, alias="from"),
+                        date_to: str | None = Query(None, alias="to"), team: str | None = None, status: str | None = None,
+                        format: str | None = None):
     # don't cache response for failed requests
     response.headers["Cache-Control"] = "no-cache, no-store, must-revalidate"
 
     try:
-        current_date = datetime.now().date()
-        current_year_season = datetime.now().year
-        next_year_season = current_year_season + 1
-    
-        mlb = mlbstatsapi.Mlb()
-        # current/previous season
-        mlb_current_year_season = mlb.get_season(season_id=current_year_season)
-        start_date_current = mlb_current_year_season.seasonstartdate
-        end_date_current = mlb_current_year_season.seasonenddate
-
-        # upcoming/next season
-        mlb_next_year_season = mlb.get_season(season_id=next_year_season)
-        start_date_next = mlb_next_year_season.seasonstartdate
-        end_date_next = mlb_next_year_season.seasonenddate
-
-        mlb_schedule = None
-
-        # if season ended we want to show the last played games
-        if datetime.now().timestamp() >= datetime.strptime(end_date_current, "%Y-%m-%d").timestamp():
-            # if current date is > next season start, we get the current date schedules
-            if datetime.now().timestamp() >= datetime.strptime(start_date_next, "%Y-%m-%d").timestamp():
-                startdate = datetime.now().date() - timedelta(days=10)
-                enddate = datetime.now().date() + timedelta(days=10)
-                mlb_schedule = mlb.get_schedule(start_date=startdate, end_date=enddate)
-            else:
-                startdate = datetime.strptime(end_date_current, "%Y-%m-%d").date() - timedelta(days=10)
-                mlb_schedule = mlb.get_schedule(start_date=startdate, end_date=end_date_current)
-        # season hasn't ended yet, we can normally query using the date today as base   
-        elif datetime.now().timestamp() < datetime.strptime(end_date_current, "%Y-%m-%d").timestamp():
-            startdate = datetime.now().date() - timedelta(days=10)
-            enddate = datetime.now().date() + timedelta(days=10)
-            mlb_schedule = mlb.get_schedule(start_date=startdate, end_date=enddate)
-
-        mlb_teams = mlb.get_teams(sport_id=1)
-        
-        schedules = []
-        # create an array of games per date
-        for date in mlb_schedule.dates:
-            game_day = date.date
-            game_list = []
-            # map the props of the game appended to list
-            for game in date.games:
-                filtered_game = {
-                    "gameId": game.gameguid,
-                    "gameDate": game.gamedate,
-                    "gameTimeUTC": game.gamedate,
-                    "gamepk": game.gamepk,
-                    "gameStatus": game.status.detailedstate,
-                    "gameLabel": game.seriesdescription,
-                    "homeTeam_name": game.teams.home.team.name,
-                    "homeTeam_id": game.teams.home.team.id,
-                    "awayTeam_name": game.teams.away.team.name,
-                    "awayTeam_id": game.teams.away.team.id,
-                    "homeTeam_score": game.teams.home.score,
-                    "awayTeam_score": game.teams.away.score,
-                    "homeTeam_seriesRecord": game.teams.home.leaguerecord,
-                    "awayTeam_seriesRecord": game.teams.away.leaguerecord
-                }
-                for team in mlb_teams:
-                    
-                    if team.id == game.teams.home.team.id:
-                        filtered_game["homeTeam_key"] = team.abbreviation
-                        filtered_game["homeTeam_city"] = team.locationname
-                        filtered_game["homeTeam_clubname"] = team.clubname
-                    elif team.id == game.teams.away.team.id:
-                        filtered_game["awayTeam_key"] = team.abbreviation
-                        filtered_game["awayTeam_city"] = team.locationname
-                        filtered_game["awayTeam_clubname"] = team.clubname
-
-                game_list.append(filtered_game)
-
-            schedules.append({
-                "date": game_day,
-                "gamesList": game_list
-            })
-        # sort using the date
-        schedules.sort(key=lambda x: x["date"])
-        
+        filters = parse_schedule_filters(date_from, date_to, team, status)
+    except ValueError as err:
+        response.status_code = 400
+        return {
+            "ok": False,
+            "data": None,
+            "error": str(err)
+        }
+
+    try:
+        body = await refresher.get("MLB/schedules")
+
         # cache response for successful request
         response.headers["Cache-Control"] = 'public, max-age=3600, s-maxage=86400, stale-while-revalidate=1800'
+        if wants_ndjson(request, format):
+            # one date group per line, streamed straight off the index
+            return ndjson_response(response, body.index.groups(**filters))
+        if filters:
+            # json or ndjson depending on Accept, caches must key on it like the unfiltered response
+            response.headers["Vary"] = "Accept, Accept-Encoding"
+            # answered from the dataset's date/team index, never from a scan of the season
+            return {
+                "ok": True,
+                "error": None,
+                "data": body.index.filter(**filters)
+            }
+
+        response.headers["ETag"] = body.etag
+        if etag_matches(request, body.etag):
+            return not_modified(response)
 
+        return encoded_response(request, response, body)
+    
+    except HTTPStatusError as err_http:
+        response.status_code = err_http.response.status_code if err_http.response.status_code in range(400, 500) else 502
         return {
-            "ok": True,
-            "error": None,
-            "data": schedules
+            "ok": False,
+            "data": None,
+            "error": f"External API Error ({err_http.response.status_code}): {err_http}"
         }
-    
-    except TheMlbStatsApiException as err:
-        response.status_code = 502
+    except TransportError as err_conn:
+        response.status_code = 504
         return {
             "ok": False,
             "data": None,
-            "error": str(err)
+            "error": f"Connection Error: {err_conn}"
         }
+    except TimeoutError:
+        response.status_code = 504
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Upstream deadline of {UPSTREAM_DEADLINE}s exceeded"
+        }
+    except Exception as err:
+        response.status_code = 500
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Internal Server Error: {str(err)}"
+        }
+
+def mlb_index_standings(result):
+    # team_id -> standings record, with the nested records bucketed by league id / type, built once per fetch
+    records = {}
+    for conference in result.get("records", []):
+        for t in conference.get("teamRecords", []):
+            split_records = t.get("records", {})
+            records[t.get("team")["id"]] = {
+                "division_id": conference.get("division", {}).get("id"),
+                "team_record": t,
+                "leagueRecords": {lr["league"]["id"]: lr for lr in split_records.get("leagueRecords", [])},
+                "overallRecords": {ovr["type"]: ovr for ovr in split_records.get("overallRecords", [])},
+                "splitRecords": {sr["type"]: sr for sr in split_records.get("splitRecords", [])},
+            }
+    return records
+
+# season -> (standings index, teams index, computed standings), reused until either upstream payload changes
+mlb_standings_memo = {}
+
+def get_mlb_leagues_standings(season, mlb_standings, mlb_teams):
+    memo = mlb_standings_memo.get(season)
+    if memo is not None:
+        if memo[0] is mlb_standings and memo[1] is mlb_teams:
+            return memo[2]
+        # a refetch after the cache ttl usually brings back the same content
+        if memo[0] == mlb_standings and memo[1] == mlb_teams:
+            mlb_standings_memo[season] = (mlb_standings, mlb_teams, memo[2])
+            return memo[2]
+
+    mlb_leagues_standings = {
+        'american_league': [], 
+        'national_league': []
+    }
+
+    for team in mlb_teams.values(): 
+        league_name = team["league"].get("name")
+        league_id = team["league"].get("id")
+        division_name = team["division"].get("name")
+        division_id = team["division"].get("id")
+
+        filtered_team = {
+            "team_id": team["id"],
+            "team_name": team.get("name"),
+            "team_key": team.get("abbreviation"),
+            "team_clubname": team.get("clubName"),
+            "team_city": team.get("locationName"),
+            "league_name": league_name,
+            "league_id": league_id,
+            "division_name": division_name,
+            "division_id": division_id,
+            "season": team.get("season"),
+        }
+
+        record = mlb_standings.get(team["id"])
+        if record and record["division_id"] == division_id:
+            t = record["team_record"]
+            filtered_team["league_rank"] = t.get("leagueRank")
+            filtered_team["conferenceGamesBack"] = t.get("leagueGamesBack")
+            filtered_team["wins"] = t.get("leagueRecord")["wins"]
+            filtered_team["losses"] = t.get("leagueRecord")["losses"]
+            filtered_team["winpct"] = t.get("leagueRecord")["pct"]
+            filtered_team["ties"] = t.get("leagueRecord")["ties"]
+            filtered_team["currentStreak"] = t.get("streak")["streakCode"]
+
+            lr = record["leagueRecords"].get(103)
+            if lr:
+                filtered_team["americanLeagueRecord"] = f"{lr['wins']}-{lr['losses']}"
+            lr = record["leagueRecords"].get(104)
+            if lr:
+                filtered_team["nationalLeagueRecord"] = f"{lr['wins']}-{lr['losses']}"
+
+            ovr = record["overallRecords"].get("home")
+            if ovr:
+                filtered_team["home"] = f"{ovr['wins']}-{ovr['losses']}"
+            ovr = record["overallRecords"].get("away")
+            if ovr:
+                filtered_team["road"] = f"{ovr['wins']}-{ovr['losses']}"
+
+            sr = record["splitRecords"].get("lastTen")
+            if sr:
+                filtered_team["lastTen"] = f"{sr['wins']}-{sr['losses']}"
+
+        if league_name == 'American League':
+            mlb_leagues_standings["american_league"].append(filtered_team)
+        elif league_name == 'National League':
+            mlb_leagues_standings["national_league"].append(filtered_team)
+
+    mlb_leagues_standings["american_league"].sort(key=lambda x: int(x["league_rank"]))
+    mlb_leagues_standings["national_league"].sort(key=lambda x: int(x["league_rank"]))
+
+    mlb_standings_memo[season] = (mlb_standings, mlb_teams, mlb_leagues_standings)
+    return mlb_leagues_standings
+
+@refresher.dataset("MLB/standings", ttl=DATASET_TTL["standings"])
+async def build_mlb_standings(now):
+    current_year = mlb_season(now)
+    url_standings = f"{MLB_STATSAPI_URL}/standings?leagueId=103%2C104&season={current_year}"
+    mlb_standings, mlb_teams = await gather_with_deadline(
+        fetch_json("statsapi", url_standings, resource="standings", transform=mlb_index_standings),
+        mlb_get_teams(current_year)
+    )
+
+    mlb_leagues_standings = get_mlb_leagues_standings(current_year, mlb_standings, mlb_teams)
+
+    return mlb_leagues_standings
 
 @app.get('/api/MLB/standings')
-def get_standings(response: Response):
+async def get_standings(request: Request, response: Response):
     # don't cache response for failed requests
     response.headers["Cache-Control"] = 'no-cache, no-store, must-revalidate'
 
     try:
-        current_year = datetime.now().year
-        mlb = mlbstatsapi.Mlb()
-        # the result is an instance of mlbstatsapi and not an object/dict
-        #  so we have to use dot notation to access properties
-        # mlb_standings = mlb.get_standings(league_id="103,104",season=current_year)
-        url_standings = f"https://statsapi.mlb.com/api/v1/standings?leagueId=103%2C104&season={current_year}"
-        res = requests.get(url_standings)
-        res.raise_for_status()
-        mlb_standings = res.json()
-        
-        mlb_teams = mlb.get_teams(sport_id=1)
-       
-        mlb_leagues_standings = {
-            'american_league': [], 
-            'national_league': []
-        }
-
-        for team in mlb_teams: 
-            league_name = team.league.name
-            league_id = team.league.id
-            division_name = team.division.name
-            division_id = team.division.id
-
-            filtered_team = {
-                "team_id": team.id,
-                "team_name": team.name,
-                "team_key": team.abbreviation,
-                "team_clubname": team.clubname,
-                "team_city": team.locationname,
-                "league_name": league_name,
-                "league_id": league_id,
-                "division_name": division_name,
-                "division_id": division_id,
-                "season": team.season,
-            }
+        body = await refresher.get("MLB/standings")
 
-            for conference in mlb_standings.get("records", []):
-                if conference.get("division",{})["id"] == division_id:
-                    for t in conference.get("teamRecords", []):
-                        if team.id == t.get("team")["id"]:
-                            filtered_team["league_rank"] = t.get("leagueRank")
-                            filtered_team["conferenceGamesBack"] = t.get("leagueGamesBack")
-                            filtered_team["wins"] = t.get("leagueRecord")["wins"]
-                            filtered_team["losses"] = t.get("leagueRecord")["losses"]
-                            filtered_team["winpct"] = t.get("leagueRecord")["pct"]
-                            filtered_team["ties"] = t.get("leagueRecord")["ties"]
-                            filtered_team["currentStreak"] = t.get("streak")["streakCode"]
-                            
-                            for lr in t.get("records",{})["leagueRecords"]:
-                                if lr["league"]["id"] == 103:
-                                    filtered_team["americanLeagueRecord"] = f"{lr['wins']}-{lr['losses']}"
-                                if lr["league"]["id"] ==  104:
-                                    filtered_team["nationalLeagueRecord"] = f"{lr['wins']}-{lr['losses']}"
-
-                            for ovr in t.get("records",{})["overallRecords"]:
-                                if ovr["type"] == "home":
-                                    filtered_team["home"] = f"{ovr['wins']}-{ovr['losses']}"
-                                elif ovr["type"] == "away":
-                                    filtered_team["road"] = f"{ovr['wins']}-{ovr['losses']}"
-
-                            for sr in t.get("records",{})["splitRecords"]:
-                                if sr["type"] == "lastTen":
-                                    filtered_team["lastTen"] = f"{sr['wins']}-{sr['losses']}"
-
-            if league_name == 'American League':
-                mlb_leagues_standings["american_league"].append(filtered_team)
-            elif league_name == 'National League':
-                mlb_leagues_standings["national_league"].append(filtered_team)
-
-        mlb_leagues_standings["american_league"].sort(key=lambda x: int(x["league_rank"]))
-        mlb_leagues_standings["national_league"].sort(key=lambda x: int(x["league_rank"]))
-        
         # cache response for successful request
         response.headers["Cache-Control"] = 'public, max-age=300, s-maxage=3600, stale-while-revalidate=1800'
+        response.headers["ETag"] = body.etag
+        if etag_matches(request, body.etag):
+            return not_modified(response)
 
-        return {
-            "ok": True,
-            "error": None,
-            "data": mlb_leagues_standings
-        }
+        return encoded_response(request, response, body)
 
-    except HTTPError as err_http:
+    except HTTPStatusError as err_http:
         response.status_code = err_http.response.status_code if err_http.response.status_code in range(400, 500) else 502
         return {
             "ok": False,
             "data": None,
             "error": f"External API Error ({err_http.response.status_code}): {err_http}"
         }
-    except ConnectionError as err_conn:
+    except TransportError as err_conn:
         response.status_code = 504
         return {
             "ok": False,
             "data": None,
             "error": f"Connection Error: {err_conn}"
         }
-    
-    except TheMlbStatsApiException as err:
-        response.status_code = 502
+    except TimeoutError:
+        response.status_code = 504
         return {
             "ok": False,
             "data": None,
-            "error": str(err)
+            "error": f"Upstream deadline of {UPSTREAM_DEADLINE}s exceeded"
         }
     except Exception as err:
         response.status_code = 500
@@ -504,116 +2243,101 @@ def get_standings(response: Response):
             "error": f"Internal Server Error: {str(err)}"
         }
     
-@app.get('/api/MLB/players')
-def get_players(response: Response):
-    response.headers["Cache-Control"] = 'no-cache, no-store, must-revalidate'
-
+@refresher.dataset("MLB/players", ttl=DATASET_TTL["players"])
+async def build_mlb_players(now):
     # final holder of the response
     playerlist = []
 
-    # holder for players list from mlb api wrapper
-    players_list = None
-    # holder for teams list from mlb api wrapper
-    teams_list = None
-
-    current_date = datetime.now().date()
-    current_year_season = datetime.now().year
-    next_year_season = current_year_season + 1
-    
-    # first try catch for data from api wrapper
-    try:
-        mlb = mlbstatsapi.Mlb()
-        players_list = mlb.get_people(sport_id=1,season=current_year_season)
-        teams_list = mlb.get_teams(sport_id=1,season=current_year_season)
+    current_year_season = mlb_season(now)
+
+    url_al = f"{MLB_STATSAPI_URL}/league/103/allStarFinalVote?season={current_year_season}"
+    url_nl = f"{MLB_STATSAPI_URL}/league/104/allStarFinalVote?season={current_year_season}"
+
+    async def get_allstar_people():
+        allstar_al, allstar_nl = await asyncio.gather(
+            fetch_json("statsapi", url_al, resource="players"),
+            fetch_json("statsapi", url_nl, resource="players")
+        )
+        # the final vote lists don't include the current team, look up just those players
+        person_ids = [p["id"] for p in allstar_al["people"] + allstar_nl["people"]]
+        players_list = await mlb_get_people(current_year_season, person_ids)
+        return allstar_al, allstar_nl, players_list
+
+    (allstar_al, allstar_nl, players_list), teams_list = await gather_with_deadline(
+        get_allstar_people(),
+        mlb_get_teams(current_year_season)
+    )
+
+    def create_allstar_list(list):
+        result = []
+        for i in range(len(list)):
+            team_id = None
+            # get player team id
+            p = players_list.get(list[i]["id"])
+            if p:
+                team_id = p.get("currentTeam", {}).get("id")
+
+            filtered_player_data = {
+                "player_name": list[i]["fullName"],
+                "player_id": list[i]["id"],
+                "player_position": list[i]["primaryPosition"]["name"],
+                "player_batside": list[i]["batSide"],
+                "player_pitchhand": list[i]["pitchHand"],
+            }
+            # get player team name/clubname
+            team = teams_list.get(team_id)
+            if team:
+                filtered_player_data["team_clubname"] = team.get("clubName")
+                filtered_player_data["team_city"] = team.get("locationName")
+                filtered_player_data["team_name"] = team.get("name")
+                filtered_player_data["team_id"] = team["id"]
+                filtered_player_data["team_key"] = team.get("abbreviation")
 
-    except TheMlbStatsApiException as err:
-        response.status_code = 502
-        return {
-            "ok": False,
-            "data": None,
-            "error": str(err)
-        }
+            result.append(filtered_player_data)
 
-    # second try catch for data not provided by the api wrapper
-    try:
-        # players = statsapi.league_leaders(leaderCategories='avg',statGroup='hitting',limit=30)
-        # mlbstatsapi doesn't provide allstar endpoints. need to create own request using the base url
-        url_al = f"https://statsapi.mlb.com/api/v1/league/103/allStarFinalVote?season={current_year_season}"
-        url_nl = f"https://statsapi.mlb.com/api/v1/league/104/allStarFinalVote?season={current_year_season}"
-        
-        al_result = requests.get(url_al)
-        al_result.raise_for_status()
-
-        nl_result = requests.get(url_nl)
-        nl_result.raise_for_status()
-
-        allstar_al = al_result.json()
-        allstar_nl = nl_result.json()
-        
-        def create_allstar_list(list):
-            result = []
-            for i in range(len(list)):
-                team_id = None
-                # get player team id
-                for p in players_list:
-                    if p.id == list[i]["id"]:
-                        team_id = p.currentteam["id"]
-                        break
+        return result
 
-                filtered_player_data = {
-                    "player_name": list[i]["fullName"],
-                    "player_id": list[i]["id"],
-                    "player_position": list[i]["primaryPosition"]["name"],
-                    "player_batside": list[i]["batSide"],
-                    "player_pitchhand": list[i]["pitchHand"],
-                }
-                # get player team name/clubname
-                for team in teams_list:
-                    if team_id == team.id:
-                        filtered_player_data["team_clubname"] = team.clubname
-                        filtered_player_data["team_city"] = team.locationname
-                        filtered_player_data["team_name"] = team.name
-                        filtered_player_data["team_id"] = team.id
-                        filtered_player_data["team_key"] = team.abbreviation
-                        break
+    allstar_nl_list  =  allstar_nl["people"]
+    allstar_al_list  =  allstar_al["people"]
+    result_nl = create_allstar_list(allstar_nl_list)
+    result_al = create_allstar_list(allstar_al_list)
 
-                result.append(filtered_player_data)
+    # alternate nl and al players, the rest of the longer list goes last
+    for player_nl, player_al in zip_longest(result_nl, result_al):
+        if player_nl is not None:
+            playerlist.append(player_nl)
+        if player_al is not None:
+            playerlist.append(player_al)
 
-            return result
+    return playerlist
 
-        allstar_nl_list  =  allstar_nl["people"]
-        allstar_al_list  =  allstar_al["people"]
-        result_nl = create_allstar_list(allstar_nl_list)
-        result_al = create_allstar_list(allstar_al_list)
+@app.get('/api/MLB/players')
+async def get_players(request: Request, response: Response):
+    response.headers["Cache-Control"] = 'no-cache, no-store, must-revalidate'
 
-        result_nl_copy = result_nl.copy()
-        result_al_copy = result_al.copy()
-        for i in range(len(result_al) + len(result_nl)):
-            if i % 2 == 0:
-                for player in result_nl_copy:
-                    playerlist.append(player)
-                    result_nl_copy.remove(player)
-                    break
-            else:
-                for player in result_al_copy:
-                    playerlist.append(player)
-                    result_al_copy.remove(player)
-                    break
-    
-    except HTTPError as err_http:
+    try:
+        body = await refresher.get("MLB/players")
+    except HTTPStatusError as err_http:
         response.status_code = err_http.response.status_code if err_http.response.status_code in range(400, 500) else 502
         return {
             "ok": False,
             "data": None,
             "error": f"External API Error ({err_http.response.status_code}): {err_http}"
         }
-    except ConnectionError as err_conn:
+    except TransportError as err_conn:
         response.status_code = 504
         return {
             "ok": False,
             "data": None,
             "error": f"Connection Error: {err_conn}"
         }
+    except TimeoutError:
+        response.status_code = 504
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Upstream deadline of {UPSTREAM_DEADLINE}s exceeded"
+        }
     except Exception as err:
         response.status_code = 500
         return {
@@ -624,95 +2348,157 @@ def get_players(response: Response):
     
     # cache response for successful request
     response.headers["Cache-Control"] = 'public, max-age=3600, s-maxage=86400, stale-while-revalidate=1800'
+    response.headers["ETag"] = body.etag
+    if etag_matches(request, body.etag):
+        return not_modified(response)
     
-    return {
-        "ok": True,
-        "error": None,
-        "data": playerlist
-    }
+    return encoded_response(request, response, body)
 
 # soccer data
 FOOTBALL_DATA_URL = os.getenv("FOOTBALL_DATA_URL")
 FOOTBALL_DATA_APIKEY = os.getenv("FOOTBALL_DATA_APIKEY")
+
+# the parts of a football-data match build_soccer_schedules projects
+SoccerTeam = record("SoccerTeam", {
+    "id": int | None,
+    "name": str | None,
+    "shortName": str | None,
+    "tla": str | None,
+    "crest": str | None,
+})
+SoccerGoals = record("SoccerGoals", {
+    "home": int | None,
+    "away": int | None,
+})
+SoccerScore = record("SoccerScore", {
+    "fullTime": SoccerGoals,
+})
+SoccerMatch = record("SoccerMatch", {
+    "id": int | None,
+    "utcDate": str,
+    "stage": str,
+    "status": str,
+    "homeTeam": SoccerTeam,
+    "awayTeam": SoccerTeam,
+    "score": SoccerScore,
+})
+SoccerMatches = record("SoccerMatches", {
+    "matches": list[SoccerMatch],
+})
+
+@refresher.dataset("SOCCER/schedules", ttl=DATASET_TTL["schedules"], indexer=ScheduleIndex)
+async def build_soccer_schedules(now):
+    current_year = soccer_season(now)
+    PL_ID = 2021
+    url = f"{FOOTBALL_DATA_URL}/competitions/{PL_ID}/matches"
+    params = {
+        "season": current_year
+    }
+
+    result, = await gather_with_deadline(
+        fetch_json("football_data", url, params=params, resource="schedules", schema=SoccerMatches)
+    )
+
+    schedules = []
+    games_list = []
+    for match in result.matches:
+        gamedate = match.utcDate.split('T')[0]
+        label = match.stage.split('_')
+        label = " ".join(label).title()
+        gamestatus = match.status.title()
+
+        filtered_game_data = {
+            "gameId": match.id,
+            "gameDate": gamedate,
+            "gameStatus": gamestatus,
+            "gameLabel": label,
+            "homeTeam_name": match.homeTeam.name,
+            "homeTeam_key": match.homeTeam.tla,
+            "homeTeam_clubname": match.homeTeam.shortName,
+            "homeTeam_id": match.homeTeam.id,
+            "homeTeam_logo": match.homeTeam.crest,
+            "homeTeam_score": match.score.fullTime.home,
+            "awayTeam_name": match.awayTeam.name,
+            "awayTeam_clubname": match.awayTeam.shortName,
+            "awayTeam_key": match.awayTeam.tla,
+            "awayTeam_id": match.awayTeam.id,
+            "awayTeam_logo": match.awayTeam.crest,
+            "awayTeam_score": match.score.fullTime.away,
+            "gameTimeUTC": match.utcDate,
+        }
+
+        games_list.append(filtered_game_data)
+
+    for date, group_games in groupby(games_list, key=lambda x: x["gameDate"]):
+        schedules.append({
+            "date": date,
+            "gamesList": list(group_games)
+        })
+
+    return schedules
+
 @app.get('/api/SOCCER/schedules')
-def get_schedules(response: Response):
+async def get_schedules(request: Request, response: Response, date_from: str | None = Query(None, alias="from"),
+                        date_to: str | None = Query(None, alias="to"), team: str | None = None, status: str | None = None,
+                        format: str | None = None):
     # don't cache response for failed requests
     response.headers["Cache-Control"] = 'no-cache, no-store, must-revalidate'
 
     try:
-        current_year = datetime.now().year
-        PL_ID = 2021
-        url = f"{FOOTBALL_DATA_URL}/competitions/{PL_ID}/matches"
-        params = {
-            "season": current_year
-        }
-        headers ={
-            "X-Auth-Token": FOOTBALL_DATA_APIKEY
-        }
-
-        result_schedules = requests.get(url, headers=headers, params=params)
-        result_schedules.raise_for_status()
-        result = result_schedules.json()
-        
-        schedules = []
-        games_list = []
-        for match in result["matches"]:
-            gamedate = match.get("utcDate").split('T')[0]
-            label = match.get('stage').split('_')
-            label = " ".join(label).title()
-            gamestatus = match.get("status").title()
-
-            filtered_game_data = {
-                "gameId": match.get("id"),
-                "gameDate": gamedate,
-                "gameStatus": gamestatus,
-                "gameLabel": label,
-                "homeTeam_name": match.get("homeTeam")["name"],
-                "homeTeam_key": match.get("homeTeam")["tla"],
-                "homeTeam_clubname": match.get("homeTeam")["shortName"],
-                "homeTeam_id": match.get("homeTeam")["id"],
-                "homeTeam_logo": match.get("homeTeam")["crest"],
-                "homeTeam_score": match.get("score")["fullTime"]["home"],
-                "awayTeam_name": match.get("awayTeam")["name"],
-                "awayTeam_clubname": match.get("awayTeam")["shortName"],
-                "awayTeam_key": match.get("awayTeam")["tla"],
-                "awayTeam_id": match.get("awayTeam")["id"],
-                "awayTeam_logo": match.get("awayTeam")["crest"],
-                "awayTeam_score": match.get("score")["fullTime"]["away"],
-                "gameTimeUTC": match.get("utcDate"),
-            }
-            
-            games_list.append(filtered_game_data)
+        filters = parse_schedule_filters(date_from, date_to, team, status)
+    except ValueError as err:
+        response.status_code = 400
+        return {
+            "ok": False,
+            "data": None,
+            "error": str(err)
+        }
+
+    try:
+        body = await refresher.get("SOCCER/schedules")
 
-        for date, group_games in groupby(games_list, key=lambda x: x["gameDate"]):
-            schedules.append({
-                "date": date,
-                "gamesList": list(group_games)
-            })
-        
         # cache response for successful request
         response.headers["Cache-Control"] = 'public, max-age=3600, s-maxage=86400, stale-while-revalidate=1800'
+        if wants_ndjson(request, format):
+            # one date group per line, streamed straight off the index
+            return ndjson_response(response, body.index.groups(**filters))
+        if filters:
+            # json or ndjson depending on Accept, caches must key on it like the unfiltered response
+            response.headers["Vary"] = "Accept, Accept-Encoding"
+            # answered from the dataset's date/team index, never from a scan of the season
+            return {
+                "ok": True,
+                "error": None,
+                "data": body.index.filter(**filters)
+            }
 
-        return {
-            "ok": True,
-            "error": None,
-            "data": schedules
-        }
+        response.headers["ETag"] = body.etag
+        if etag_matches(request, body.etag):
+            return not_modified(response)
+
+        return encoded_response(request, response, body)
     
-    except HTTPError as err_http:
+    except HTTPStatusError as err_http:
         response.status_code = err_http.response.status_code if err_http.response.status_code in range(400, 500) else 502
         return {
             "ok": False,
             "data": None,
             "error": f"External API Error ({err_http.response.status_code}): {err_http}"
         }
-    except ConnectionError as err_conn:
+    except TransportError as err_conn:
         response.status_code = 504
         return {
             "ok": False,
             "data": None,
             "error": f"Connection Error: {err_conn}"
         }
+    except TimeoutError:
+        response.status_code = 504
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Upstream deadline of {UPSTREAM_DEADLINE}s exceeded"
+        }
     except Exception as err:
         response.status_code = 500
         return {
@@ -721,75 +2507,84 @@ def get_schedules(response: Response):
             "error": f"Internal Server Error: {str(err)}"
         }
 
+@refresher.dataset("SOCCER/standings", ttl=DATASET_TTL["standings"])
+async def build_soccer_standings(now):
+    current_year = soccer_season(now)
+    PL_ID = 2021
+    url = f"{FOOTBALL_DATA_URL}/competitions/{PL_ID}/standings"
+    params = {
+        "season": current_year
+    }
+
+    result, = await gather_with_deadline(
+        fetch_json("football_data", url, params=params, resource="standings")
+    )
+
+    standings_list = []
+
+    for team in result["standings"][0]["table"]:
+        filtered_team_data = {
+            "team_name": team.get("team")["name"],
+            "team_key": team.get("team")["tla"],
+            "team_clubname": team.get("team")["shortName"],
+            "team_id": team.get("team")["id"],
+            "team_logo": team.get("team")["crest"],
+            "played_games": team.get("playedGames"),
+            "ties": team.get("draw"),
+            "wins": team.get("won"),
+            "losses": team.get("lost"),
+            "league_rank": team.get("position"),
+            "winpct": None,
+            "last_five": team.get('form'),
+            "goal_difference": team.get('goalDifference'),
+            "points": team.get('points'),
+            "goals_total": team.get('goalsFor'),
+            "goals_against": team.get('goalsAgainst'),
+            "league_name": result['competition']["name"],
+            "league_id": result['competition']["id"],
+            "league_logo": result['competition']["emblem"],
+            "season": result['filters']["season"]
+        }
+        standings_list.append(filtered_team_data)
+
+    return standings_list
+
 @app.get('/api/SOCCER/standings')
-def get_standings(response: Response):
+async def get_standings(request: Request, response: Response):
     # don't cache response for failed requests
     response.headers["Cache-Control"] = 'no-cache, no-store, must-revalidate'
 
     try:
-        current_year = datetime.now().year
-        PL_ID = 2021
-        url = f"{FOOTBALL_DATA_URL}/competitions/{PL_ID}/standings"
-        params = {
-            "season": current_year
-        }
-        headers ={
-            "X-Auth-Token": FOOTBALL_DATA_APIKEY
-        }
-        
-        result_standings = requests.get(url,headers=headers, params=params)
-        result_standings.raise_for_status()
-        result = result_standings.json()
-        
-        standings_list = []
-
-        for team in result["standings"][0]["table"]:
-            filtered_team_data = {
-                "team_name": team.get("team")["name"],
-                "team_key": team.get("team")["tla"],
-                "team_clubname": team.get("team")["shortName"],
-                "team_id": team.get("team")["id"],
-                "team_logo": team.get("team")["crest"],
-                "played_games": team.get("playedGames"),
-                "ties": team.get("draw"),
-                "wins": team.get("won"),
-                "losses": team.get("lost"),
-                "league_rank": team.get("position"),
-                "winpct": None,
-                "last_five": team.get('form'),
-                "goal_difference": team.get('goalDifference'),
-                "points": team.get('points'),
-                "goals_total": team.get('goalsFor'),
-                "goals_against": team.get('goalsAgainst'),
-                "league_name": result['competition']["name"],
-                "league_id": result['competition']["id"],
-                "league_logo": result['competition']["emblem"],
-                "season": result['filters']["season"]
-            }
-            standings_list.append(filtered_team_data)
+        body = await refresher.get("SOCCER/standings")
 
         # cache response for successful request
         response.headers["Cache-Control"] = 'public, max-age=300, s-maxage=3600, stale-while-revalidate=1800'
+        response.headers["ETag"] = body.etag
+        if etag_matches(request, body.etag):
+            return not_modified(response)
 
-        return {
-            "ok": True,
-            "error": None,
-            "data": standings_list
-        }
-    except HTTPError as err_http:
+        return encoded_response(request, response, body)
+    except HTTPStatusError as err_http:
         response.status_code = err_http.response.status_code if err_http.response.status_code in range(400, 500) else 502
         return {
             "ok": False,
             "data": None,
             "error": f"External API Error ({err_http.response.status_code}): {err_http}"
         }
-    except ConnectionError as err_conn:
+    except TransportError as err_conn:
         response.status_code = 504
         return {
             "ok": False,
             "data": None,
             "error": f"Connection Error: {err_conn}"
         }
+    except TimeoutError:
+        response.status_code = 504
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Upstream deadline of {UPSTREAM_DEADLINE}s exceeded"
+        }
     except Exception as err:
         response.status_code = 500
         return {
@@ -798,66 +2593,75 @@ def get_standings(response: Response):
             "error": f"Internal Server Error: {str(err)}"
         }
 
+@refresher.dataset("SOCCER/players", ttl=DATASET_TTL["players"])
+async def build_soccer_players(now):
+    current_year = soccer_season(now)
+    # pre-selected league/competition. later, implement a selectable dropdown for different competitions
+    PL_ID = 2021
+    url = f"{FOOTBALL_DATA_URL}/competitions/{PL_ID}/scorers"
+    params = {
+        "season": current_year,
+        "limit": 20
+    }
+
+    result, = await gather_with_deadline(
+        fetch_json("football_data", url, params=params, resource="players")
+    )
+
+    playerlist = []
+
+    for p in result["scorers"]:
+        filtered_player_data ={
+            "player_name": f"{p['player'].get('name')}".strip(),
+            "player_id": p["player"].get("id"),
+            "player_position": p["player"].get("section"),
+            "team_name": p["team"].get("name"),
+            "team_key": p["team"].get("tla"),
+            "team_clubname": p["team"].get("shortName"),
+            "team_id": p["team"].get("id"),
+            "team_logo": p["team"].get("crest")
+        }
+        playerlist.append(filtered_player_data)
+
+    return playerlist
+
 @app.get('/api/SOCCER/players')
-def get_players(response: Response):
+async def get_players(request: Request, response: Response):
     # don't cache response for failed requests
     response.headers["Cache-Control"] = 'no-cache, no-store, must-revalidate'
 
     try:
-        current_year=datetime.now().year
-        # pre-selected league/competition. later, implement a selectable dropdown for different competitions
-        PL_ID = 2021
-        url = f"{FOOTBALL_DATA_URL}/competitions/{PL_ID}/scorers"
-        params = {
-            "season": current_year,
-            "limit": 20
-        }
-        headers ={
-            "X-Auth-Token": FOOTBALL_DATA_APIKEY
-        }
-
-        result_players = requests.get(url,headers=headers, params=params)
-        result_players.raise_for_status()
-        result = result_players.json()
-        
-        playerlist = []
-
-        for p in result["scorers"]:
-            filtered_player_data ={
-                "player_name": f"{p["player"].get("name")}".strip(),
-                "player_id": p["player"].get("id"),
-                "player_position": p["player"].get("section"),
-                "team_name": p["team"].get("name"),
-                "team_key": p["team"].get("tla"),
-                "team_clubname": p["team"].get("shortName"),
-                "team_id": p["team"].get("id"),
-                "team_logo": p["team"].get("crest")
-            }
-            playerlist.append(filtered_player_data)
+        body = await refresher.get("SOCCER/players")
 
         # cache response for successful request
         response.headers["Cache-Control"] = 'public, max-age=3600, s-maxage=86400, stale-while-revalidate=1800'
+        response.headers["ETag"] = body.etag
+        if etag_matches(request, body.etag):
+            return not_modified(response)
 
-        return {
-            "ok": True,
-            "error": None,
-            "data": playerlist
-        }
+        return encoded_response(request, response, body)
     
-    except HTTPError as err_http:
+    except HTTPStatusError as err_http:
         response.status_code = err_http.response.status_code if err_http.response.status_code in range(400, 500) else 502
         return {
             "ok": False,
             "data": None,
             "error": f"External API Error ({err_http.response.status_code}): {err_http}"
         }
-    except ConnectionError as err_conn:
+    except TransportError as err_conn:
         response.status_code = 504
         return {
             "ok": False,
             "data": None,
             "error": f"Connection Error: {err_conn}"
         }
+    except TimeoutError:
+        response.status_code = 504
+        return {
+            "ok": False,
+            "data": None,
+            "error": f"Upstream deadline of {UPSTREAM_DEADLINE}s exceeded"
+        }
     except Exception as err:
         response.status_code = 500
         return {
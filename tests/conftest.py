@@ -0,0 +1,36 @@
+import os
+import sys
+import time
+import pytest
+
+# index.py lives at the repo root, next to this folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# no snapshot file or refresh loop from the tests
+os.environ.setdefault("SNAPSHOT_PATH", "")
+os.environ.setdefault("BACKGROUND_REFRESH", "0")
+
+import index
+from fastapi.testclient import TestClient
+
+@pytest.fixture
+def client():
+    # no lifespan, so no background refresher or pre-warming
+    return TestClient(index.app)
+
+@pytest.fixture
+def warm_dataset():
+    # serves the given data as if the dataset had just been built, so requests make no upstream calls
+    saved = []
+
+    def warm(name, data):
+        dataset = index.refresher.datasets[name]
+        saved.append((dataset, dict(vars(dataset))))
+        dataset.body = index.EncodedBody(data, dataset.indexer, dataset.view)
+        dataset.built_at = time.monotonic()
+        dataset.next_refresh = dataset.built_at + dataset.ttl
+        dataset.snapshot_checked = True
+        return dataset
+
+    yield warm
+    for dataset, state in saved:
+        vars(dataset).update(state)
@@ -0,0 +1,62 @@
+import time
+import asyncio
+import httpx
+import pytest
+import index
+
+
+def test_circuit_breaker_opens_after_threshold():
+    breaker = index.CircuitBreaker("test", threshold=3, cooldown=60)
+    for _ in range(2):
+        breaker.failure()
+        assert breaker.allow()
+    breaker.failure()
+    assert not breaker.allow()
+    assert breaker.status() == {"open": True, "failures": 3}
+
+def test_circuit_breaker_lets_one_trial_through_per_cooldown():
+    breaker = index.CircuitBreaker("test", threshold=1, cooldown=0.1)
+    breaker.failure()
+    assert not breaker.allow()
+    time.sleep(0.12)
+    # half-open: one trial, the next call waits for another cooldown
+    assert breaker.allow()
+    assert not breaker.allow()
+
+def test_circuit_breaker_closes_on_success():
+    breaker = index.CircuitBreaker("test", threshold=1, cooldown=0)
+    breaker.failure()
+    assert breaker.allow()
+    breaker.success()
+    assert breaker.status() == {"open": False, "failures": 0}
+    assert breaker.allow()
+
+def test_open_circuit_fails_fast_without_calling_the_provider(monkeypatch):
+    calls = []
+
+    def upstream(request):
+        calls.append(request)
+        return httpx.Response(503)
+
+    async def run():
+        monkeypatch.setitem(index.circuit_breakers, "statsapi", index.CircuitBreaker("statsapi", threshold=1, cooldown=60))
+        monkeypatch.setitem(index.http_clients, "statsapi", httpx.AsyncClient(transport=httpx.MockTransport(upstream)))
+        with pytest.raises(httpx.HTTPStatusError):
+            await index.fetch_json("statsapi", "https://example.com/breaker")
+        with pytest.raises(index.UpstreamUnavailable):
+            await index.fetch_json("statsapi", "https://example.com/breaker")
+
+    asyncio.run(run())
+    assert len(calls) == 1
+
+def test_open_circuit_serves_the_stale_payload(monkeypatch):
+    key = ("statsapi", "https://example.com/stale", ())
+    index.upstream_cache.set(key, {"teams": []}, 0)
+    breaker = index.CircuitBreaker("statsapi", threshold=1, cooldown=60)
+    breaker.failure()
+    monkeypatch.setitem(index.circuit_breakers, "statsapi", breaker)
+    try:
+        result = asyncio.run(index.fetch_json("statsapi", "https://example.com/stale", resource="teams"))
+    finally:
+        index.upstream_cache.entries.pop(key, None)
+    assert result == {"teams": []}
@@ -0,0 +1,64 @@
+import asyncio
+import httpx
+from datetime import datetime
+import index
+
+# trimmed from the real statsapi responses, /people only has currentTeam when it is hydrated
+ALLSTAR_AL = {"people": [{"id": 592450, "fullName": "Aaron Judge", "link": "/api/v1/people/592450",
+                          "primaryPosition": {"code": "9", "name": "Outfielder", "type": "Outfielder", "abbreviation": "RF"},
+                          "batSide": {"code": "R", "description": "Right"}, "pitchHand": {"code": "R", "description": "Right"}}]}
+ALLSTAR_NL = {"people": [{"id": 660271, "fullName": "Shohei Ohtani", "link": "/api/v1/people/660271",
+                          "primaryPosition": {"code": "Y", "name": "Two-Way Player", "type": "Two-Way Player", "abbreviation": "TWP"},
+                          "batSide": {"code": "L", "description": "Left"}, "pitchHand": {"code": "R", "description": "Right"}}]}
+PEOPLE = {
+    592450: {"id": 592450, "fullName": "Aaron Judge", "link": "/api/v1/people/592450", "active": True,
+             "currentTeam": {"id": 147, "link": "/api/v1/teams/147"}},
+    660271: {"id": 660271, "fullName": "Shohei Ohtani", "link": "/api/v1/people/660271", "active": True,
+             "currentTeam": {"id": 119, "link": "/api/v1/teams/119"}},
+}
+TEAMS = {"teams": [
+    {"id": 147, "name": "New York Yankees", "abbreviation": "NYY", "teamName": "Yankees", "locationName": "Bronx", "clubName": "Yankees"},
+    {"id": 119, "name": "Los Angeles Dodgers", "abbreviation": "LAD", "teamName": "Dodgers", "locationName": "Los Angeles", "clubName": "Dodgers"},
+]}
+
+def statsapi(request, requests):
+    requests.append(request)
+    path = request.url.path
+    if path.endswith("/103/allStarFinalVote"):
+        return httpx.Response(200, json=ALLSTAR_AL)
+    if path.endswith("/104/allStarFinalVote"):
+        return httpx.Response(200, json=ALLSTAR_NL)
+    if path.endswith("/teams"):
+        return httpx.Response(200, json=TEAMS)
+    if path.endswith("/people"):
+        hydrated = "currentTeam" in request.url.params.get("hydrate", "")
+        ids = [int(person_id) for person_id in request.url.params["personIds"].split(",")]
+        return httpx.Response(200, json={"people": [
+            PEOPLE[person_id] if hydrated else {k: v for k, v in PEOPLE[person_id].items() if k != "currentTeam"}
+            for person_id in ids]})
+    return httpx.Response(404)
+
+def test_mlb_players_hydrate_the_current_team():
+    requests = []
+
+    async def run():
+        index.upstream_cache.entries.clear()
+        transport = httpx.MockTransport(lambda request: statsapi(request, requests))
+        index.http_clients["statsapi"] = httpx.AsyncClient(transport=transport)
+        try:
+            return await index.build_mlb_players(datetime(2026, 7, 10))
+        finally:
+            await index.http_clients.pop("statsapi").aclose()
+            index.upstream_cache.entries.clear()
+
+    players = asyncio.run(run())
+    people = [request for request in requests if request.url.path.endswith("/people")]
+    assert len(people) == 1
+    assert people[0].url.params["hydrate"] == "currentTeam"
+    assert people[0].url.params["personIds"] == "592450,660271"
+
+    # nl and al alternate, each with the team it plays for
+    assert [(p["player_name"], p["team_id"], p["team_key"], p["team_clubname"]) for p in players] == [
+        ("Shohei Ohtani", 119, "LAD", "Dodgers"),
+        ("Aaron Judge", 147, "NYY", "Yankees"),
+    ]
@@ -0,0 +1,81 @@
+import time
+import asyncio
+import httpx
+import pytest
+from datetime import date, timedelta
+import index
+
+TODAY = date(2026, 7, 15)
+
+def statsapi_game(game_day, state):
+    return {"gamePk": game_day.toordinal(), "gameDate": f"{game_day}T23:05:00Z",
+            "status": {"abstractGameState": state, "detailedState": state}}
+
+@pytest.fixture
+def schedule_upstream(monkeypatch):
+    # answers /schedule for any date range, no games on the 13th like an off day
+    requests = []
+
+    def upstream(request):
+        requests.append((request.url.params["startDate"], request.url.params["endDate"]))
+        start = date.fromisoformat(request.url.params["startDate"])
+        end = date.fromisoformat(request.url.params["endDate"])
+        dates = []
+        for i in range((end - start).days + 1):
+            game_day = start + timedelta(days=i)
+            if game_day.day != 13:
+                state = "Final" if game_day < TODAY else "Live" if game_day == TODAY else "Preview"
+                dates.append({"date": game_day.isoformat(), "games": [statsapi_game(game_day, state)]})
+        return httpx.Response(200, json={"dates": dates})
+
+    monkeypatch.setitem(index.http_clients, "statsapi", httpx.AsyncClient(transport=httpx.MockTransport(upstream)))
+    index.mlb_schedule_cache.entries.clear()
+    yield requests
+    index.mlb_schedule_cache.entries.clear()
+
+def get_schedule(start, end):
+    return asyncio.run(index.mlb_get_schedule(start, end, TODAY))
+
+def ttl(game_day):
+    return index.mlb_schedule_cache.entries[game_day][0] - time.monotonic()
+
+def test_date_ttl_depends_on_the_games_state():
+    final = [statsapi_game(TODAY - timedelta(days=5), "Final")]
+    postponed = [statsapi_game(TODAY - timedelta(days=5), "Preview")]
+    assert index.mlb_schedule_date_ttl(TODAY, [], TODAY) == index.MLB_SCHEDULE_TTL["live"]
+    assert index.mlb_schedule_date_ttl(TODAY - timedelta(days=1), final, TODAY) == index.MLB_SCHEDULE_TTL["live"]
+    assert index.mlb_schedule_date_ttl(TODAY - timedelta(days=5), final, TODAY) == index.MLB_SCHEDULE_TTL["final"]
+    assert index.mlb_schedule_date_ttl(TODAY - timedelta(days=5), postponed, TODAY) == index.MLB_SCHEDULE_TTL["upcoming"]
+    assert index.mlb_schedule_date_ttl(TODAY + timedelta(days=1), [], TODAY) == index.MLB_SCHEDULE_TTL["upcoming"]
+
+def test_each_date_is_cached_with_its_own_ttl(schedule_upstream):
+    schedule = get_schedule(TODAY - timedelta(days=3), TODAY + timedelta(days=1))
+    assert schedule_upstream == [("2026-07-12", "2026-07-16")]
+    # the 13th had no games and is left out of the result but still cached
+    assert [d["date"] for d in schedule["dates"]] == ["2026-07-12", "2026-07-14", "2026-07-15", "2026-07-16"]
+    assert index.mlb_schedule_cache.entries[date(2026, 7, 13)][1] == []
+
+    assert ttl(date(2026, 7, 12)) == pytest.approx(index.MLB_SCHEDULE_TTL["final"], abs=5)
+    assert ttl(date(2026, 7, 14)) == pytest.approx(index.MLB_SCHEDULE_TTL["live"], abs=5)
+    assert ttl(date(2026, 7, 15)) == pytest.approx(index.MLB_SCHEDULE_TTL["live"], abs=5)
+    assert ttl(date(2026, 7, 16)) == pytest.approx(index.MLB_SCHEDULE_TTL["upcoming"], abs=5)
+
+def test_only_missing_dates_are_fetched(schedule_upstream):
+    get_schedule(date(2026, 7, 10), date(2026, 7, 12))
+    get_schedule(date(2026, 7, 14), date(2026, 7, 15))
+    schedule_upstream.clear()
+
+    # three gaps in the window, one call per contiguous range
+    schedule = get_schedule(date(2026, 7, 8), date(2026, 7, 16))
+    assert sorted(schedule_upstream) == [("2026-07-08", "2026-07-09"), ("2026-07-13", "2026-07-13"), ("2026-07-16", "2026-07-16")]
+    assert len(schedule["dates"]) == 8
+
+def test_expired_live_dates_are_refetched_alone(schedule_upstream):
+    get_schedule(date(2026, 7, 10), date(2026, 7, 16))
+    schedule_upstream.clear()
+
+    # let today's entry expire as the live ttl would
+    _, games = index.mlb_schedule_cache.entries[TODAY]
+    index.mlb_schedule_cache.entries[TODAY] = (time.monotonic() - 1, games)
+    get_schedule(date(2026, 7, 10), date(2026, 7, 16))
+    assert schedule_upstream == [("2026-07-15", "2026-07-15")]
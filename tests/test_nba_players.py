@@ -0,0 +1,62 @@
+import httpx
+import pytest
+import index
+
+TEAMS = [{"TeamID": 1, "Name": "Celtics", "City": "Boston", "WikipediaLogoUrl": "https://example.com/bos.svg"},
+         {"TeamID": 2, "Name": "Lakers", "City": "Los Angeles", "WikipediaLogoUrl": "https://example.com/lal.svg"}]
+
+def player(player_id, position, team_id, team_key, **stats):
+    row = {"player_id": player_id, "player_name": f"Player {player_id}", "player_position": position,
+           "team_id": team_id, "team_key": team_key}
+    return {**row, **{column: stats.get(column, 0) for column in index.NBAPlayerStats.COLUMNS}}
+
+PLAYERS = [
+    player(1, "PG", 1, "BOS", fantasy_points=100, rebounds=5, points=10, assists=9),
+    player(2, "C", 2, "LAL", fantasy_points=300, rebounds=12, points=20, assists=1),
+    player(3, "PG", 2, "LAL", fantasy_points=200, rebounds=3, points=30, assists=7),
+    player(4, "SF", None, None, fantasy_points=50, rebounds=12, points=5, assists=2),
+]
+
+@pytest.fixture
+def players(warm_dataset):
+    return warm_dataset("NBA/players", {"players": PLAYERS, "teams": TEAMS})
+
+@pytest.fixture
+def no_upstream():
+    # any upstream call fails the request
+    index.http_clients["sportsdata"] = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(500)))
+    yield
+    index.http_clients.pop("sportsdata")
+
+def ids(res):
+    assert res.status_code == 200
+    return [p["player_id"] for p in res.json()["data"]]
+
+def test_default_leaderboard_is_the_encoded_body(client, players, no_upstream):
+    res = client.get("/api/NBA/players")
+    assert ids(res) == [2, 3, 1, 4]
+    assert res.headers["ETag"] == players.body.etag
+    assert res.json()["data"][0]["team_name"] == "Lakers"
+
+@pytest.mark.parametrize("query, expected", [
+    ("sort=rebounds", [2, 4, 1, 3]),
+    ("sort=points&limit=2", [3, 2]),
+    ("position=pg", [3, 1]),
+    ("team=lal", [2, 3]),
+    ("team=1", [1]),
+    ("weights=assists:1", [1, 3, 4, 2]),
+    ("weights=points:1,rebounds:-1&position=pg", [3, 1]),
+])
+def test_custom_leaderboards_rank_from_the_dataset(client, players, no_upstream, query, expected):
+    assert ids(client.get(f"/api/NBA/players?{query}")) == expected
+
+def test_custom_leaderboard_scores_and_teams(client, players, no_upstream):
+    top, = client.get("/api/NBA/players?sort=points&limit=1").json()["data"]
+    assert top["player_points"] == 30
+    assert (top["team_name"], top["team_city"]) == ("Lakers", "Los Angeles")
+
+@pytest.mark.parametrize("query", ["sort=bogus", "limit=0", "limit=501", "weights=points:x", "weights=height:1"])
+def test_invalid_ranking_parameters_are_rejected(client, players, query):
+    res = client.get(f"/api/NBA/players?{query}")
+    assert res.status_code == 400
+    assert res.json()["ok"] is False
@@ -0,0 +1,80 @@
+import time
+import asyncio
+import httpx
+import pytest
+import index
+
+
+def test_rate_limiter_burst_uses_whole_quota():
+    async def run():
+        limiter = index.RateLimiter("test", 3, period=10)
+        for _ in range(3):
+            await limiter.acquire(1, timeout=0.1)
+        assert limiter.status()["available"] == 0
+
+    asyncio.run(run())
+
+def test_rate_limiter_token_returns_after_period():
+    async def run():
+        limiter = index.RateLimiter("test", 1, period=0.2)
+        await limiter.acquire(1, timeout=0.1)
+        started = time.monotonic()
+        await limiter.acquire(1, timeout=1)
+        return time.monotonic() - started
+
+    waited = asyncio.run(run())
+    assert 0.15 <= waited < 0.6
+
+def test_rate_limiter_serves_waiters_by_priority():
+    async def run():
+        limiter = index.RateLimiter("test", 1, period=0.1)
+        await limiter.acquire(0, timeout=0.1)
+        order = []
+
+        async def call(priority, name):
+            await limiter.acquire(priority, timeout=2)
+            order.append(name)
+
+        # arrive in the opposite order of their priority
+        await asyncio.gather(call(3, "teams"), call(2, "standings"), call(0, "schedules"))
+        return order
+
+    assert asyncio.run(run()) == ["schedules", "standings", "teams"]
+
+def test_rate_limiter_waiter_times_out_and_is_skipped():
+    async def run():
+        limiter = index.RateLimiter("test", 1, period=0.2)
+        await limiter.acquire(1, timeout=0.1)
+        with pytest.raises(TimeoutError):
+            await limiter.acquire(0, timeout=0.05)
+        # the timed out waiter doesn't hold on to the next token
+        await limiter.acquire(1, timeout=1)
+        return limiter.status()["queued"]
+
+    assert asyncio.run(run()) == 0
+
+def test_rate_limiter_try_acquire_never_waits():
+    async def run():
+        limiter = index.RateLimiter("test", 1, period=10)
+        return limiter.try_acquire(), limiter.try_acquire()
+
+    assert asyncio.run(run()) == (True, False)
+
+def test_rate_limiter_pause_holds_tokens():
+    async def run():
+        limiter = index.RateLimiter("test", 5, period=10)
+        limiter.pause(0.2)
+        started = time.monotonic()
+        await limiter.acquire(1, timeout=1)
+        return time.monotonic() - started
+
+    assert 0.15 <= asyncio.run(run()) < 0.6
+
+def test_429_pauses_the_provider_for_retry_after(monkeypatch):
+    async def run():
+        limiter = index.RateLimiter("statsapi", 5, period=10)
+        monkeypatch.setitem(index.rate_limiters, "statsapi", limiter)
+        index.check_rate_limited("statsapi", httpx.Response(429, headers={"Retry-After": "30"}))
+        return limiter.try_acquire()
+
+    assert asyncio.run(run()) is False
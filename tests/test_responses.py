@@ -0,0 +1,63 @@
+import gzip
+import brotli
+import pytest
+
+# big enough to be stored compressed
+STANDINGS = {"east": [{"team_id": i, "team_name": f"Team {i}", "winpct": 0.5} for i in range(40)], "west": []}
+
+
+# encoding negotiation
+
+@pytest.mark.parametrize("accept_encoding, encoding", [
+    ("br, gzip", "br"),
+    ("gzip", "gzip"),
+    ("*", "br"),
+    ("br;q=0, *", "gzip"),
+    ("br;q=0, gzip;q=0, *", None),
+    ("gzip;q=0, br", "br"),
+    ("*;q=0", None),
+    ("identity", None),
+])
+def test_encoding_follows_accept_encoding(client, warm_dataset, accept_encoding, encoding):
+    warm_dataset("NBA/standings", STANDINGS)
+    res = client.get("/api/NBA/standings", headers={"Accept-Encoding": accept_encoding})
+    assert res.status_code == 200
+    assert res.headers.get("Content-Encoding") == encoding
+    assert "Accept-Encoding" in res.headers["Vary"]
+    assert res.json()["data"] == STANDINGS
+
+def test_encoded_bodies_decode_to_the_same_json(warm_dataset):
+    body = warm_dataset("NBA/standings", STANDINGS).body
+    assert brotli.decompress(body.content["br"]) == body.content["identity"]
+    assert gzip.decompress(body.content["gzip"]) == body.content["identity"]
+
+def test_small_bodies_are_not_compressed(client, warm_dataset):
+    warm_dataset("NBA/standings", {"east": [], "west": []})
+    res = client.get("/api/NBA/standings", headers={"Accept-Encoding": "br, gzip"})
+    assert "Content-Encoding" not in res.headers
+
+
+# ETag and If-None-Match
+
+def test_matching_etag_gets_304_with_the_same_headers(client, warm_dataset):
+    warm_dataset("NBA/standings", STANDINGS)
+    first = client.get("/api/NBA/standings", headers={"Accept-Encoding": "br"})
+    res = client.get("/api/NBA/standings", headers={"If-None-Match": first.headers["ETag"], "Accept-Encoding": "br"})
+    assert res.status_code == 304
+    assert res.content == b""
+    for header in ("ETag", "Cache-Control", "Vary"):
+        assert res.headers[header] == first.headers[header]
+
+@pytest.mark.parametrize("if_none_match", ['"other", {etag}', "W/{etag}", "*"])
+def test_if_none_match_lists_weak_tags_and_wildcard(client, warm_dataset, if_none_match):
+    etag = warm_dataset("NBA/standings", STANDINGS).body.etag
+    res = client.get("/api/NBA/standings", headers={"If-None-Match": if_none_match.format(etag=etag)})
+    assert res.status_code == 304
+
+def test_etag_changes_with_the_data(client, warm_dataset):
+    warm_dataset("NBA/standings", STANDINGS)
+    etag = client.get("/api/NBA/standings").headers["ETag"]
+    warm_dataset("NBA/standings", {**STANDINGS, "west": [{"team_id": 99}]})
+    res = client.get("/api/NBA/standings", headers={"If-None-Match": etag})
+    assert res.status_code == 200
+    assert res.headers["ETag"] != etag
@@ -0,0 +1,110 @@
+import json
+import pytest
+from datetime import date, timedelta
+import index
+
+
+def game(game_id, home, away, status="Scheduled"):
+    return {"gameId": game_id, "gameStatus": status, "homeTeam_id": home, "homeTeam_key": f"T{home}",
+            "awayTeam_id": away, "awayTeam_key": f"T{away}"}
+
+SCHEDULES = [
+    {"date": "2026-10-01T00:00:00", "gamesList": [game(1, 1, 2, "Final"), game(2, 3, 4, "Final")]},
+    {"date": "2026-10-03T00:00:00", "gamesList": [game(3, 2, 3, "Final")]},
+    {"date": "2026-10-05T00:00:00", "gamesList": [game(4, 1, 3, "In Progress")]},
+    {"date": "2026-10-07T00:00:00", "gamesList": [game(5, 4, 1), game(6, 2, 4)]},
+]
+
+def game_ids(schedules):
+    return [g["gameId"] for group in schedules for g in group["gamesList"]]
+
+def test_schedule_index_date_range_is_inclusive():
+    schedule_index = index.ScheduleIndex(SCHEDULES)
+    assert game_ids(schedule_index.filter(date_from="2026-10-03", date_to="2026-10-05")) == [3, 4]
+    assert game_ids(schedule_index.filter(date_from="2026-10-06")) == [5, 6]
+    assert game_ids(schedule_index.filter(date_to="2026-10-01")) == [1, 2]
+
+def test_schedule_index_team_postings_by_id_and_key():
+    schedule_index = index.ScheduleIndex(SCHEDULES)
+    assert game_ids(schedule_index.filter(team="1")) == [1, 4, 5]
+    assert game_ids(schedule_index.filter(team="t1")) == [1, 4, 5]
+    assert game_ids(schedule_index.filter(team="1", date_from="2026-10-02", date_to="2026-10-06")) == [4]
+    assert schedule_index.filter(team="99") == []
+
+def test_schedule_index_status_is_normalized():
+    schedule_index = index.ScheduleIndex(SCHEDULES)
+    assert game_ids(schedule_index.filter(status="inprogress")) == [4]
+    assert game_ids(schedule_index.filter(status="FINAL", team="3")) == [2, 3]
+
+def test_schedule_index_groups_keep_dates():
+    groups = index.ScheduleIndex(SCHEDULES).filter(team="4")
+    assert [group["date"] for group in groups] == ["2026-10-01T00:00:00", "2026-10-07T00:00:00"]
+    assert game_ids(groups) == [2, 5, 6]
+
+def test_schedule_index_team_schedule_splits_at_today():
+    schedule_index = index.ScheduleIndex(SCHEDULES)
+    team_schedule = schedule_index.team_schedule("1", "2026-10-05", last=5, upcoming=5)
+    assert [g["gameId"] for g in team_schedule["last"]] == [1]
+    assert [g["gameId"] for g in team_schedule["next"]] == [4, 5]
+    team_schedule = schedule_index.team_schedule("3", "2026-10-08", last=2, upcoming=2)
+    assert [g["gameId"] for g in team_schedule["last"]] == [3, 4]
+    assert team_schedule["next"] == []
+    assert schedule_index.team_schedule("99", "2026-10-05") is None
+
+def test_schedule_index_keeps_undated_games():
+    schedules = SCHEDULES + [{"date": None, "gamesList": [game(7, 1, 2, "Postponed")]}]
+    schedule_index = index.ScheduleIndex(schedules)
+    assert game_ids(schedule_index.filter(team="1")) == [7, 1, 4, 5]
+    assert game_ids(schedule_index.filter(team="1", date_from="2026-10-01")) == [1, 4, 5]
+
+# /api/NBA/schedules filters
+
+def test_schedules_endpoint_filters_from_the_index(client, warm_dataset):
+    warm_dataset("NBA/schedules", SCHEDULES)
+    res = client.get("/api/NBA/schedules?team=T1&from=2026-10-02&status=in progress")
+    assert res.status_code == 200
+    assert game_ids(res.json()["data"]) == [4]
+    assert "Accept" in res.headers["Vary"]
+
+def test_schedules_endpoint_streams_filtered_ndjson(client, warm_dataset):
+    warm_dataset("NBA/schedules", SCHEDULES)
+    res = client.get("/api/NBA/schedules?team=4&format=ndjson")
+    assert res.headers["Content-Type"].startswith("application/x-ndjson")
+    groups = [json.loads(line) for line in res.text.splitlines()]
+    assert [group["date"] for group in groups] == ["2026-10-01T00:00:00", "2026-10-07T00:00:00"]
+    assert game_ids(groups) == [2, 5, 6]
+
+@pytest.mark.parametrize("query", ["from=10/01/2026", "to=2026-13-01"])
+def test_schedules_endpoint_rejects_bad_dates(client, warm_dataset, query):
+    warm_dataset("NBA/schedules", SCHEDULES)
+    res = client.get(f"/api/NBA/schedules?{query}")
+    assert res.status_code == 400
+
+# /api/{league}/teams/{team_id}/schedule
+
+def day(offset):
+    return f"{date.today() + timedelta(days=offset)}T00:00:00"
+
+def test_team_schedule_endpoint_counts_today_as_upcoming(client, warm_dataset):
+    warm_dataset("MLB/schedules", [
+        {"date": day(-2), "gamesList": [game(1, 1, 2, "Final")]},
+        {"date": day(-1), "gamesList": [game(2, 3, 1, "Final")]},
+        {"date": day(0), "gamesList": [game(3, 1, 4, "In Progress")]},
+        {"date": day(1), "gamesList": [game(4, 2, 3)]},
+    ])
+    res = client.get("/api/mlb/teams/1/schedule?last=1&next=5")
+    assert res.status_code == 200
+    data = res.json()["data"]
+    assert [g["gameId"] for g in data["last"]] == [2]
+    assert [g["gameId"] for g in data["next"]] == [3]
+
+@pytest.mark.parametrize("path, status", [
+    ("/api/MLB/teams/99/schedule", 404),
+    ("/api/NHL/teams/1/schedule", 404),
+    ("/api/MLB/teams/1/schedule?last=101", 400),
+])
+def test_team_schedule_endpoint_errors(client, warm_dataset, path, status):
+    warm_dataset("MLB/schedules", SCHEDULES)
+    res = client.get(path)
+    assert res.status_code == status
+    assert res.json()["ok"] is False
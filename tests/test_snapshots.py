@@ -0,0 +1,89 @@
+import time
+import json
+import sqlite3
+import asyncio
+import pytest
+import index
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = index.SnapshotStore(str(tmp_path / "snapshots.sqlite3"), max_age=3600)
+    monkeypatch.setattr(index, "snapshot_store", store)
+    return store
+
+def test_saved_data_loads_back(store):
+    store.save("NBA/standings", {"east": [{"team_id": 1}], "west": []})
+    saved_at, data = store.load("NBA/standings")
+    assert data == {"east": [{"team_id": 1}], "west": []}
+    assert time.time() - saved_at < 5
+    assert store.load("NBA/players") is None
+
+def test_old_or_outdated_snapshots_are_ignored(store):
+    store.save("NBA/standings", [1])
+    with sqlite3.connect(store.path) as conn:
+        conn.execute("UPDATE snapshots SET saved_at = saved_at - 7200")
+    assert store.load("NBA/standings") is None
+
+    store.save("NBA/standings", [1])
+    with sqlite3.connect(store.path) as conn:
+        conn.execute("UPDATE snapshots SET version = ?", (store.VERSION - 1,))
+    assert store.load("NBA/standings") is None
+
+def test_broken_or_disabled_store_only_costs_the_warm_start(tmp_path):
+    broken = tmp_path / "broken.sqlite3"
+    broken.write_bytes(b"not a database")
+    assert index.SnapshotStore(str(broken), max_age=3600).load("NBA/standings") is None
+    disabled = index.SnapshotStore("", max_age=3600)
+    disabled.save("NBA/standings", [1])
+    assert disabled.load("NBA/standings") is None
+
+def test_cold_dataset_serves_the_snapshot_then_revalidates(store):
+    store.save("test", {"version": "snapshot"})
+    builds = []
+
+    async def builder(now):
+        builds.append(now)
+        await asyncio.sleep(0.05)
+        return {"version": "upstream"}
+
+    async def run():
+        dataset = index.Dataset("test", builder, ttl=60)
+        body = await dataset.get()
+        served = (json.loads(body.content["identity"])["data"], dataset.source)
+        # the rebuild started in the background replaces the snapshot and saves over it
+        await dataset.refreshing
+        return served, json.loads(dataset.body.content["identity"])["data"], dataset.source
+
+    served, rebuilt, source = asyncio.run(run())
+    assert served == ({"version": "snapshot"}, "snapshot")
+    assert (rebuilt, source) == ({"version": "upstream"}, "upstream")
+    assert len(builds) == 1
+    assert store.load("test")[1] == {"version": "upstream"}
+
+def test_snapshot_is_only_tried_once(store):
+    async def builder(now):
+        return []
+
+    async def run():
+        dataset = index.Dataset("test", builder, ttl=60)
+        first, second = dataset.load_snapshot(), dataset.load_snapshot()
+        assert first is second
+        assert await first is False
+        return dataset.load_snapshot()
+
+    assert asyncio.run(run()) is None
+
+def test_indexed_dataset_rebuilds_its_index_from_the_snapshot(store):
+    players = [{"player_id": i, "player_name": f"Player {i}", "player_position": "PG", "team_id": 1, "team_key": "BOS",
+                **{column: i for column in index.NBAPlayerStats.COLUMNS}} for i in range(3)]
+    store.save("NBA/players", {"players": players, "teams": [{"TeamID": 1, "Name": "Celtics", "City": "Boston"}]})
+    dataset = index.refresher.datasets["NBA/players"]
+
+    async def run():
+        copy = index.Dataset("NBA/players", dataset.builder, dataset.ttl, dataset.indexer, dataset.view)
+        assert await copy.load_snapshot()
+        return copy.body
+
+    body = asyncio.run(run())
+    assert [p["player_id"] for p in json.loads(body.content["identity"])["data"]] == [2, 1, 0]
+    assert body.index.leaderboard(sort="points", limit=1)[0]["team_name"] == "Celtics"
@@ -0,0 +1,63 @@
+import json
+import asyncio
+import httpx
+import pytest
+import index
+
+
+class ChunkedStream(httpx.AsyncByteStream):
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    async def __aiter__(self):
+        for chunk in self.chunks:
+            yield chunk
+
+def collect_stream(chunks):
+    async def run():
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, stream=ChunkedStream(chunks)))
+        index.http_clients["statsapi"] = httpx.AsyncClient(transport=transport)
+        try:
+            return [item async for item in index.stream_json_array("statsapi", "https://example.com/items")]
+        finally:
+            await index.http_clients.pop("statsapi").aclose()
+
+    return asyncio.run(run())
+
+def test_stream_json_array_items_split_across_chunks():
+    chunks = [b' [{"a": 1, "b": "x', b'y"}', b', {"a"', b': [2, 3]}, 4', b'5, "s,]"', b' ]']
+    assert collect_stream(chunks) == [{"a": 1, "b": "xy"}, {"a": [2, 3]}, 45, "s,]"]
+
+def test_stream_json_array_one_byte_chunks():
+    payload = b'[{"k": "v"}, [1, {"n": null}], true]'
+    assert collect_stream([payload[i:i + 1] for i in range(len(payload))]) == [{"k": "v"}, [1, {"n": None}], True]
+
+def test_stream_json_array_empty():
+    assert collect_stream([b"[", b"]"]) == []
+
+def test_stream_json_array_rejects_non_array():
+    with pytest.raises(ValueError):
+        collect_stream([b'{"a": 1}'])
+
+def test_stream_json_array_rejects_truncated_payload():
+    with pytest.raises(ValueError):
+        collect_stream([b'[{"a": 1}, {"a"'])
+
+def test_player_stats_are_projected_while_streaming(monkeypatch):
+    rows = [{"PlayerID": i, "Name": f"Player {i}", "Position": "PG", "TeamID": 1, "Team": "BOS", "FantasyPoints": 10 * i,
+             "PlayerEfficiencyRating": 15.0, "PlusMinus": i, "Points": 100 * i, "Rebounds": 5, "Assists": 3, "Steals": 1,
+             "Minutes": 900} for i in range(1, 6)]
+    payload = json.dumps(rows).encode()
+
+    async def run():
+        stream = ChunkedStream([payload[i:i + 64] for i in range(0, len(payload), 64)])
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, stream=stream))
+        monkeypatch.setitem(index.http_clients, "sportsdata", httpx.AsyncClient(transport=transport))
+        # uncached, the transform runs on this stream
+        return await index.fetch_json("sportsdata", "https://example.com/PlayerSeasonStats/2026",
+                                      transform=index.NBAPlayerStats.from_stream, stream=True)
+
+    player_stats = asyncio.run(run())
+    assert len(player_stats.players) == 5
+    assert "Minutes" not in player_stats.players[0]
+    assert [p["player_id"] for p in player_stats.rank(sort="points", limit=2)] == [5, 4]